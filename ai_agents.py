@@ -43,7 +43,7 @@ class SpymasterAgent(AIAgent):
     
     def generate_clue(self, game_state: GameState) -> Tuple[str, int, List[str]]:
         """Generate a clue based on the game state"""
-        board_state = game_state.get_spymaster_state(self.team)
+        board_state = game_state.get_spymaster_state()
         
         # Gather words by type
         team_words = []
@@ -201,7 +201,7 @@ class OperativeAgent(AIAgent):
             Tuple of (guess_word, reasoning, confidence)
             where confidence is a float between 0 and 1
         """
-        board_state = game_state.get_visible_state(self.team)
+        board_state = game_state.get_visible_state()
         
         # Create lists of revealed and unrevealed words
         unrevealed_words = []
@@ -660,7 +660,7 @@ class AIGameManager:
     
     def _get_ai_clue(self, spymaster: AIPlayer, game_state: GameState) -> Tuple[str, int, List[str]]:
         """Get a clue from an AI spymaster"""
-        board_state = game_state.get_spymaster_state(spymaster.team)
+        board_state = game_state.get_spymaster_state()
         
         # Prepare the message for the AI
         team_words = []
@@ -828,7 +828,7 @@ The TARGETS must be words from your team's list above, and the NUMBER must match
     
     def _get_ai_guess(self, operative: AIPlayer, game_state: GameState, clue: str, number: int) -> str:
         """Get a guess from an AI operative or decide to end turn"""
-        board_state = game_state.get_visible_state(operative.team)
+        board_state = game_state.get_visible_state()
         
         # Create a list of unrevealed words
         unrevealed_words = []
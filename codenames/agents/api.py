@@ -0,0 +1,182 @@
+"""
+Shared language model access for Codenames AI agents.
+Reuses one API client (and its connection pool) for all requests, limits the number
+of concurrent requests and retries rate-limited ones with backoff.
+"""
+
+import atexit
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Optional
+
+import openai
+
+
+# Maximum number of API requests in flight at once, across all agents
+MAX_CONCURRENCY = int(os.getenv("CODENAMES_MAX_CONCURRENCY", "8"))
+
+# Attempts per request before a rate limit error is given up on
+MAX_ATTEMPTS = 6
+
+# Bounds for the randomized exponential backoff, in seconds
+MIN_BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+
+# Request timeout in seconds
+REQUEST_TIMEOUT = 60.0
+
+logger = logging.getLogger(__name__)
+
+_semaphore = threading.BoundedSemaphore(MAX_CONCURRENCY)
+_lock = threading.Lock()
+_client: Optional[openai.OpenAI] = None
+# time.monotonic() until which no new request is sent, set from Retry-After
+_paused_until = 0.0
+
+
+def get_client() -> openai.OpenAI:
+    """
+    Return the shared API client, creating it on first use.
+
+    Its HTTP connections are kept alive between requests, so TCP and TLS setup
+    is paid once rather than per request. Created lazily so the API key can
+    still be set after import.
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            _client = openai.OpenAI(timeout=REQUEST_TIMEOUT)
+        return _client
+
+
+@atexit.register
+def close_client():
+    """Close the shared API client's connections; the next request opens a new client"""
+    global _client
+    with _lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+
+
+def _retry_after(error: openai.RateLimitError) -> Optional[float]:
+    """Seconds from the response's Retry-After header, or None if it has none"""
+    retry_after = error.response.headers.get("retry-after") if error.response is not None else None
+    if retry_after is None:
+        return None
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    """Random exponential backoff in seconds for a retry after the given attempt (0-based)"""
+    return min(MAX_BACKOFF, random.uniform(MIN_BACKOFF, MIN_BACKOFF * 2 ** (attempt + 1)))
+
+
+def _wait_for_pause():
+    """Block while a Retry-After pause from an earlier rate limit error is in effect"""
+    delay = _paused_until - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+
+
+class _SlotStream:
+    """
+    A streamed response that holds its request slot until it is consumed.
+
+    The slot is released when iteration ends (or fails), on close(), when used
+    as a context manager, or at the latest when the stream is garbage collected.
+    """
+
+    def __init__(self, stream: Any):
+        self._stream = stream
+        self._released = False
+
+    def __iter__(self):
+        try:
+            yield from self._stream
+        finally:
+            self.close()
+
+    def close(self):
+        """Close the underlying stream and release the request slot, once"""
+        if self._released:
+            return
+        self._released = True
+        try:
+            close = getattr(self._stream, "close", None)
+            if close is not None:
+                close()
+        finally:
+            _semaphore.release()
+
+    def __enter__(self) -> "_SlotStream":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+def chat_completion(model: str, system_message: str, user_message: str, **kwargs) -> Any:
+    """
+    Create a chat completion for a system and a user message.
+
+    At most MAX_CONCURRENCY requests run at once. Rate limit errors are retried
+    up to MAX_ATTEMPTS times with backoff; a Retry-After from the server pauses
+    all new requests, not just the one that was limited.
+
+    With stream=True the request counts against MAX_CONCURRENCY until the
+    returned stream is consumed or closed. Only the request itself is retried:
+    a rate limit is reported before the first chunk, while an error part way
+    through the stream is raised to the caller, who has already seen the text
+    received until then.
+
+    Args:
+        model: Model name
+        system_message: System prompt
+        user_message: User prompt
+        **kwargs: Further arguments for chat.completions.create
+
+    Returns:
+        The chat completion response, or an iterable of chunks with stream=True
+    """
+    global _paused_until
+    messages = [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": user_message}
+    ]
+    for attempt in range(MAX_ATTEMPTS):
+        _wait_for_pause()
+        _semaphore.acquire()
+        try:
+            response = get_client().chat.completions.create(model=model, messages=messages, **kwargs)
+        except openai.RateLimitError as e:
+            _semaphore.release()
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = _retry_after(e)
+            if delay is not None:
+                # The server says when it accepts requests again; hold back every caller until then
+                with _lock:
+                    _paused_until = max(_paused_until, time.monotonic() + delay)
+            else:
+                delay = _backoff(attempt)
+                time.sleep(delay)
+            logger.warning("Rate limited, retrying in %.1fs (attempt %d of %d)", delay, attempt + 1, MAX_ATTEMPTS)
+            continue
+        except BaseException:
+            _semaphore.release()
+            raise
+        if kwargs.get("stream"):
+            # The slot stays taken while the response is streamed
+            return _SlotStream(response)
+        _semaphore.release()
+        return response
@@ -3,23 +3,57 @@ Team debate and decision mechanisms for Codenames AI agents.
 Contains debate, voting, and consensus mechanisms for multi-agent decision making.
 """
 
+import itertools
+import math
 import random
 import re
-from typing import Dict, List, Tuple, Any, Optional
-from collections import Counter
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, List, Tuple, Any, Optional, Pattern
+from concurrent.futures import CancelledError, ThreadPoolExecutor, wait
+from functools import partial
 
 from ..game import GameState
-from .operative import OperativeAgent
+from .operative import OperativeAgent, format_board_context, format_debate_entry
+
+
+# Quoted words in debate messages, e.g. 'apple' or "apple"
+_QUOTED_RE = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+
+# Least time in seconds an agent call gets when a debate is running over its budget
+MIN_CALL_TIMEOUT = 1.0
 
 
 class DebateManager:
     """Manages debates between multiple agents"""
-    def __init__(self, max_rounds: int = 3):
+    def __init__(self, max_rounds: int = 3, batch_requests: bool = False, cache_size: int = 0,
+                 budget_s: Optional[float] = None):
+        """
+        Args:
+            max_rounds: Maximum number of debate rounds, including the initial proposals
+            batch_requests: Ask for all proposals and all final votes in one API request
+                            when the agents share a prompt (the provider must support n > 1)
+            cache_size: Number of debate results to remember and reuse when the same clue
+                        comes up on the same unrevealed board after the same guesses
+                        (0 disables the cache)
+            budget_s: Time budget for a whole debate in seconds (None for no limit); agents
+                      that haven't answered in time are left out of that step
+        """
         self.max_rounds = max_rounds
+        self.batch_requests = batch_requests
+        self.cache_size = cache_size
+        self.budget_s = budget_s
+        # Debate results by (clue, number, team, unrevealed words, correct guesses, previous
+        # guess words), least recently used first
+        self._cache: OrderedDict = OrderedDict()
+        # Last result of _board_words, keyed by the unrevealed words it was built for
+        self._board_words_cache = None
     
     def run_debate(self, agents: List[OperativeAgent], game_state: GameState, 
                   clue: str, number: int, correct_guesses: int, 
-                  previous_guesses: List[Dict]) -> Dict[str, Any]:
+                  previous_guesses: List[Dict],
+                  cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
         """Run a multi-round debate between agents to decide on a guess
         
         Args:
@@ -29,22 +63,66 @@ class DebateManager:
             number: The number given with the clue
             correct_guesses: Number of correct guesses made so far
             previous_guesses: List of previous guesses in this turn
+            cancel_event: Optional event that stops the debate once set; it is checked
+                          before every round of agent calls, so calls already sent finish
             
         Returns:
-            Dict containing debate_log, final_decision, vote_counts, and reasoning
+            Dict containing debate_log, final_decision, vote_counts, reasoning, and
+            cached (True if the result was reused from an earlier identical debate)
+        
+        Raises:
+            CancelledError: If cancel_event was set before the debate was decided
         """
+        if self.cache_size > 0:
+            # The guesses so far this turn are part of the prompts, so they are part of the key
+            cache_key = (clue.lower(), number, game_state.current_team,
+                         frozenset(game_state.unrevealed_lower_words), correct_guesses,
+                         tuple(guess["word"].lower() for guess in previous_guesses))
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                print(f"\n===== REUSING TEAM DECISION FOR CLUE: '{clue}' {number}: {cached['final_decision']} =====")
+                return self._copy_result(cached, cached=True)
+        
+        # time.monotonic() by which the debate should be decided
+        deadline = time.monotonic() + self.budget_s if self.budget_s is not None else None
+        
+        # The board is the same for every agent and round, so it is rendered for the prompts once
+        board_context = format_board_context(game_state)
+        
         # Initial proposals
         debate_log = []
+        # debate_log as the agents read it, extended as entries are added
+        transcript = ""
         print(f"\n===== STARTING TEAM DEBATE ABOUT CLUE: '{clue}' {number} =====")
         
         # First round: Each agent proposes a guess with reasoning
         print("\n--- ROUND 1: INITIAL PROPOSALS ---")
         proposals = {}
-        for agent in agents:
-            guess, reasoning, confidence = agent.generate_guess(
-                game_state, clue, number, correct_guesses, previous_guesses, is_bonus_guess=False
+        # Guesses of the latest round, in agent order, for the supermajority check
+        round_guesses = []
+        # Latest guess each agent stated
+        positions = {}
+        # Proposals are independent, so ask all agents at once
+        self._check_cancelled(cancel_event)
+        if self.batch_requests:
+            initial_guesses = self._gather([partial(
+                OperativeAgent.generate_guess_batch,
+                agents, game_state, clue, number, correct_guesses, previous_guesses, board_context
+            )], deadline)[0] or [None] * len(agents)
+        else:
+            initial_guesses = self._call_agents(
+                agents, "generate_guess",
+                game_state, clue, number, correct_guesses, previous_guesses,
+                board_context=board_context, deadline=deadline
             )
-            
+        for agent, initial_guess in zip(agents, initial_guesses):
+            if initial_guess is None:
+                print(f"{agent.name} ran out of time and makes no proposal")
+                continue
+            # Batched guesses come without a confidence
+            guess, reasoning, *confidence = initial_guess
+            confidence = confidence[0] if confidence else None
             proposals[agent.name] = {
                 "guess": guess,
                 "reasoning": reasoning,
@@ -58,21 +136,45 @@ class DebateManager:
                 "message": message,
                 "guess": guess
             })
+            transcript += format_debate_entry(debate_log[-1])
+            round_guesses.append(guess)
+            positions[agent.name] = guess
             
             print(f"{agent.name} proposes: {guess}")
             print(f"Reasoning: {reasoning[:100]}..." if len(reasoning) > 100 else f"Reasoning: {reasoning}")
             print()
         
-        # Additional debate rounds
+        # The board doesn't change during the debate, so match its words once
+        board_words = self._board_words(game_state)
+        
+        # Additional debate rounds, unless the team already agrees
         for round_num in range(2, self.max_rounds + 1):
+            if self._has_supermajority(round_guesses, len(agents)):
+                print(f"Supermajority reached in round {round_num - 1}, skipping to the vote")
+                break
+            round_guesses = []
+            
             print(f"\n--- ROUND {round_num}: DISCUSSION ---")
             
+            # Responses stay sequential: each agent reads the messages before it in this round
             for agent in agents:
                 # Agent responds to the ongoing debate
-                response = agent.debate_response(debate_log, game_state, clue, number)
+                self._check_cancelled(cancel_event)
+                response = self._call_agents(
+                    [agent], "debate_response",
+                    debate_log, game_state, clue, number, transcript=transcript,
+                    board_context=board_context, deadline=deadline
+                )[0]
+                if response is None:
+                    # Out of time: the agent keeps its latest position
+                    print(f"{agent.name} ran out of time and keeps their position")
+                    round_guesses.append(positions.get(agent.name))
+                    continue
                 
                 # Try to extract a current preference from the response
-                current_guess = self._extract_preference(response, game_state)
+                current_guess = self._extract_preference(response, game_state, board_words)
+                if current_guess:
+                    positions[agent.name] = current_guess
                 
                 debate_log.append({
                     "round": round_num,
@@ -80,20 +182,59 @@ class DebateManager:
                     "message": response,
                     "guess": current_guess
                 })
+                transcript += format_debate_entry(debate_log[-1])
+                round_guesses.append(current_guess)
                 
                 print(f"{agent.name}: {response[:150]}..." if len(response) > 150 else f"{agent.name}: {response}")
                 if current_guess:
                     print(f"Current preference: {current_guess}")
                 print()
         
+        if len(debate_log) == len(agents) and len(set(round_guesses)) == 1:
+            # Every agent proposed the same guess and there was no discussion; a vote would only repeat it
+            final_decision = round_guesses[0]
+            vote_counts = {final_decision: len(agents)}
+            print(f"\nFINAL DECISION: {final_decision} (proposed by all {len(agents)} agents)")
+        else:
+            self._check_cancelled(cancel_event)
+            final_decision, vote_counts = self._vote(agents, debate_log, game_state, clue, number, deadline)
+        
+        # Collect reasoning for the final decision (the first two messages are enough)
+        final_reasoning = list(itertools.islice(
+            (f"{entry['agent']}: {entry['message']}" for entry in debate_log
+             if entry["guess"] == final_decision),
+            2
+        ))
+        
+        result = {
+            "debate_log": debate_log,
+            "final_decision": final_decision,
+            "vote_counts": vote_counts,
+            "reasoning": final_reasoning or ["No specific reasoning provided"],
+            "cached": False
+        }
+        
+        if self.cache_size > 0:
+            self._cache[cache_key] = self._copy_result(result)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return result
+    
+    def _vote(self, agents: List[OperativeAgent], debate_log: List[Dict], game_state: GameState,
+              clue: str, number: int, deadline: Optional[float] = None) -> Tuple[Optional[str], Dict[str, int]]:
+        """Hold the final vote over every guess proposed in the debate (plus "end")
+        
+        Agents that haven't voted by deadline (a time.monotonic() value) abstain.
+        
+        Returns:
+            Tuple of (final_decision, vote_counts); ties are broken randomly
+        """
         # Final voting round
         print("\n--- FINAL VOTING ROUND ---")
         
         # Collect all unique proposed guesses (including "end")
-        all_guesses = set()
-        for entry in debate_log:
-            if entry.get("guess"):
-                all_guesses.add(entry.get("guess"))
+        all_guesses = {entry["guess"] for entry in debate_log if entry["guess"]}
         
         # Ensure "end" is always an option
         all_guesses.add("end")
@@ -102,44 +243,119 @@ class DebateManager:
         voting_options = sorted(list(all_guesses))
         print(f"Voting options: {', '.join(voting_options)}")
         
-        # Each agent casts a final vote
+        # Each agent casts a final vote; votes are independent, so they are collected at once
         votes = {}
-        for agent in agents:
-            vote = agent.final_vote(debate_log, voting_options, game_state, clue, number)
+        if self.batch_requests:
+            final_votes = self._gather([partial(
+                OperativeAgent.final_vote_batch,
+                agents, debate_log, voting_options, game_state, clue, number
+            )], deadline)[0] or [None] * len(agents)
+        else:
+            final_votes = self._call_agents(agents, "final_vote", debate_log, voting_options, game_state, clue, number,
+                                            deadline=deadline)
+        for agent, vote in zip(agents, final_votes):
+            if vote is None:
+                print(f"{agent.name} ran out of time and abstains")
+                continue
             votes[agent.name] = vote
             print(f"{agent.name} votes for: {vote}")
         
-        # Count votes
-        vote_counter = Counter(votes.values())
-        top_votes = vote_counter.most_common()
+        # Count votes, tracking the highest count as we go
+        vote_counts = {}
+        top_count = 0
+        for vote in votes.values():
+            count = vote_counts[vote] = vote_counts.get(vote, 0) + 1
+            if count > top_count:
+                top_count = count
         
         # If there's a tie, break it randomly
-        if len(top_votes) > 1 and top_votes[0][1] == top_votes[1][1]:
-            tied_options = [option for option, count in top_votes if count == top_votes[0][1]]
+        tied_options = [option for option, count in vote_counts.items() if count == top_count]
+        if len(tied_options) > 1:
             final_decision = random.choice(tied_options)
             print(f"\nTIE BREAKER: Randomly selected '{final_decision}' from tied options: {tied_options}")
         else:
-            final_decision = top_votes[0][0]
+            final_decision = tied_options[0] if tied_options else None
         
-        print(f"\nFINAL DECISION: {final_decision} (with {vote_counter[final_decision]} out of {len(agents)} votes)")
+        print(f"\nFINAL DECISION: {final_decision} (with {top_count} out of {len(agents)} votes)")
         
-        # Collect reasoning for the final decision
-        final_reasoning = []
-        for entry in debate_log:
-            if entry.get("guess") == final_decision:
-                final_reasoning.append(f"{entry['agent']}: {entry['message']}")
-        
-        result = {
-            "debate_log": debate_log,
-            "final_decision": final_decision,
-            "vote_counts": dict(vote_counter),
-            "reasoning": final_reasoning[:2] if final_reasoning else ["No specific reasoning provided"]
+        return final_decision, vote_counts
+    
+    @staticmethod
+    def _copy_result(result: Dict[str, Any], **changes) -> Dict[str, Any]:
+        """Copy a debate result, so callers can't change what is stored in the cache"""
+        return {
+            **result,
+            "debate_log": [dict(entry) for entry in result["debate_log"]],
+            "vote_counts": dict(result["vote_counts"]),
+            "reasoning": list(result["reasoning"]),
+            **changes
         }
+    
+    @staticmethod
+    def _check_cancelled(cancel_event: Optional[threading.Event]):
+        """Raise CancelledError if the debate's cancel_event is set"""
+        if cancel_event is not None and cancel_event.is_set():
+            print("\n===== DEBATE CANCELLED =====")
+            raise CancelledError("Debate cancelled")
+    
+    def _has_supermajority(self, round_guesses: List[Optional[str]], num_agents: int) -> bool:
+        """Check if at least two thirds of the agents backed the same guess in a round"""
+        counts = Counter(guess for guess in round_guesses if guess)
+        if not counts:
+            return False
+        return counts.most_common(1)[0][1] >= math.ceil(2 * num_agents / 3)
+    
+    def _call_agents(self, agents: List[OperativeAgent], method: str, *args,
+                     deadline: Optional[float] = None, **kwargs) -> List[Any]:
+        """Call the same method on every agent concurrently (the calls are LLM requests).
         
-        return result
+        Results are returned in the order of agents; see _gather for deadline.
+        """
+        return self._gather([partial(getattr(agent, method), *args, **kwargs) for agent in agents], deadline)
+    
+    def _gather(self, calls: List[Callable[[], Any]], deadline: Optional[float] = None) -> List[Any]:
+        """Run calls concurrently and return their results in order.
+        
+        With a deadline (a time.monotonic() value), each call gets at least
+        MIN_CALL_TIMEOUT seconds; calls that haven't finished by then are
+        abandoned and give None.
+        """
+        if deadline is None and len(calls) <= 1:
+            return [call() for call in calls]
+        if not calls:
+            return []
+        
+        pool = ThreadPoolExecutor(max_workers=len(calls))
+        try:
+            futures = [pool.submit(call) for call in calls]
+            timeout = None if deadline is None else max(MIN_CALL_TIMEOUT, deadline - time.monotonic())
+            wait(futures, timeout=timeout)
+        finally:
+            # Don't wait for stragglers; their threads finish in the background
+            pool.shutdown(wait=False, cancel_futures=True)
+        return [future.result() if future.done() else None for future in futures]
+    
+    def _board_words(self, game_state: GameState) -> Tuple[Tuple[str, ...], frozenset, Optional[Pattern]]:
+        """Unrevealed board words (lowercase, in board order), the same words as a set,
+        and one regex matching any of them"""
+        unrevealed_words = game_state.unrevealed_lower_words
+        if self._board_words_cache is not None and self._board_words_cache[0] == unrevealed_words:
+            return self._board_words_cache[1]
+        
+        # Longest words first, so a word isn't shadowed by a shorter one it starts with
+        alternatives = sorted(set(unrevealed_words), key=len, reverse=True)
+        pattern = re.compile(r'\b(' + '|'.join(map(re.escape, alternatives)) + r')\b') if alternatives else None
+        board_words = (unrevealed_words, frozenset(unrevealed_words), pattern)
+        self._board_words_cache = (unrevealed_words, board_words)
+        return board_words
     
-    def _extract_preference(self, message: str, game_state: GameState) -> Optional[str]:
-        """Try to extract the current word preference from a debate message"""
+    def _extract_preference(self, message: str, game_state: GameState,
+                            board_words: Optional[Tuple[Tuple[str, ...], frozenset, Optional[Pattern]]] = None) -> Optional[str]:
+        """Try to extract the current word preference from a debate message
+        
+        board_words is the result of _board_words for game_state; it is built
+        here if not given.
+        """
         message = message.lower()
         
         # Check for explicit "end turn" mentions
@@ -148,20 +364,20 @@ class DebateManager:
             return "end"
         
         # Check for board words
-        unrevealed_words = [card.word.lower() for card in game_state.board if not card.revealed]
+        unrevealed_words, unrevealed_set, board_pattern = board_words or self._board_words(game_state)
+        if board_pattern is None:
+            return None
         
         # Check for quotes which might indicate a word preference
-        quoted = re.findall(r"'([^']*)'|\"([^\"]*)\"", message)
-        for match in quoted:
+        for match in _QUOTED_RE.findall(message):
             for potential in match:
-                if potential.lower() in unrevealed_words:
-                    return potential.lower()
+                if potential in unrevealed_set:
+                    return potential
         
-        # Look for direct mentions of board words
+        # Look for direct mentions of board words, preferring the first in board order
+        mentioned = set(board_pattern.findall(message))
         for word in unrevealed_words:
-            # Check if word is mentioned as a standalone term
-            word_pattern = r'\b' + re.escape(word) + r'\b'
-            if re.search(word_pattern, message, re.IGNORECASE):
+            if word in mentioned:
                 return word
         
         # If we can't confidently extract a preference, return None
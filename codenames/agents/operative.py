@@ -5,10 +5,37 @@ Contains AI implementations for the Operative role.
 
 import re
 import random
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Sequence, Tuple, Any, Optional
 
-import openai
 from ..game import GameState, CardType
+from .api import chat_completion
+
+
+_GUESS_SYSTEM_MESSAGE = "You are a Codenames Operative AI. Your goal is to correctly identify words related to your Spymaster's clue."
+_VOTE_SYSTEM_MESSAGE = "You are a Codenames Operative making a final decision."
+
+
+def format_debate_entry(entry: Dict[str, Any]) -> str:
+    """Format one debate log entry the way it appears in the debate prompt"""
+    return f"{entry['agent']}: {entry['message'][:200]}...\n\n"
+
+
+def format_board_context(game_state: GameState) -> str:
+    """Format the board the way it appears in operative prompts: unrevealed words,
+    then revealed words by type. It is the same for every operative on the board."""
+    unrevealed_words = []
+    revealed_by_type = {"red": [], "blue": [], "neutral": [], "assassin": []}
+    for card in game_state.board:
+        if card.revealed:
+            revealed_by_type[card.type.value].append(card.word)
+        else:
+            unrevealed_words.append(card.word)
+    
+    return f"""- Unrevealed words: {', '.join(unrevealed_words)}
+- Revealed Red Team words: {', '.join(revealed_by_type['red'])}
+- Revealed Blue Team words: {', '.join(revealed_by_type['blue'])}
+- Revealed Neutral words: {', '.join(revealed_by_type['neutral'])}
+- Revealed Assassin words: {', '.join(revealed_by_type['assassin'])}"""
 
 
 class OperativeAgent:
@@ -23,36 +50,86 @@ class OperativeAgent:
     def make_api_call(self, system_message: str, user_message: str) -> str:
         """Make an API call to the language model"""
         try:
-            client = openai.OpenAI()
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
+            response = chat_completion(self.model, system_message, user_message,
+                                       temperature=0.7, max_tokens=500)
             return response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Error making API call: {e}")
             return f"Error: {str(e)[:100]}..."
     
+    def make_api_calls(self, system_message: str, user_message: str, n: int) -> List[str]:
+        """Get n independent completions for the same prompt in a single API call
+        
+        Falls back to n separate calls if the provider rejects the request.
+        """
+        try:
+            response = chat_completion(self.model, system_message, user_message,
+                                       temperature=0.7, max_tokens=500, n=n)
+            completions = [choice.message.content.strip() for choice in response.choices]
+            if len(completions) == n:
+                return completions
+        except Exception as e:
+            print(f"Error making batched API call, falling back to single calls: {e}")
+        return [self.make_api_call(system_message, user_message) for _ in range(n)]
+    
+    @staticmethod
+    def _can_batch(agents: List["OperativeAgent"]) -> bool:
+        """Agents can share a request if they would send the same prompt to the same model"""
+        return len(agents) > 1 and len({(type(agent), agent.model, agent.team) for agent in agents}) == 1
+    
+    @classmethod
+    def generate_guess_batch(cls, agents: List["OperativeAgent"], game_state: GameState, clue: str,
+                             number: int, correct_guesses: int, previous_guesses: List[Dict],
+                             board_context: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Generate one guess per agent, using a single API call when the agents share a prompt
+        Returns a list of (guess_word, reasoning) tuples in the order of agents
+        """
+        if board_context is None:
+            board_context = format_board_context(game_state)
+        if not cls._can_batch(agents):
+            return [agent.generate_guess(game_state, clue, number, correct_guesses, previous_guesses,
+                                         board_context=board_context)
+                    for agent in agents]
+        
+        prompt, unrevealed_words = agents[0]._guess_prompt(game_state, clue, number, correct_guesses,
+                                                           previous_guesses, board_context)
+        responses = agents[0].make_api_calls(_GUESS_SYSTEM_MESSAGE, prompt, len(agents))
+        return [agent._parse_guess(response_text, prompt, unrevealed_words)
+                for agent, response_text in zip(agents, responses)]
+    
+    @classmethod
+    def final_vote_batch(cls, agents: List["OperativeAgent"], debate_log: List[Dict[str, Any]],
+                         options: List[str], game_state: GameState, clue: str, number: int) -> List[str]:
+        """Cast one final vote per agent, using a single API call when the agents share a prompt
+        Returns the votes in the order of agents
+        """
+        if not cls._can_batch(agents):
+            return [agent.final_vote(debate_log, options, game_state, clue, number) for agent in agents]
+        
+        prompt = agents[0]._final_vote_prompt(debate_log, options, clue, number)
+        responses = agents[0].make_api_calls(_VOTE_SYSTEM_MESSAGE, prompt, len(agents))
+        return [agent._parse_vote(vote, options) for agent, vote in zip(agents, responses)]
+    
     def generate_guess(self, game_state: GameState, clue: str, number: int, 
-                       correct_guesses: int, previous_guesses: List[Dict]) -> Tuple[str, str]:
+                       correct_guesses: int, previous_guesses: List[Dict],
+                       board_context: Optional[str] = None) -> Tuple[str, str]:
         """Generate a guess based on the clue and game state
+        
+        board_context is format_board_context(game_state); a debate renders it once
+        and passes it to every operative.
         Returns a tuple of (guess_word, reasoning)
         """
-        board_state = game_state.get_visible_state(self.team)
-        
-        # Create lists of revealed and unrevealed words
-        unrevealed_words = []
-        revealed_words = []
-        for card in game_state.board:
-            if not card.revealed:
-                unrevealed_words.append(card.word)
-            else:
-                revealed_words.append(card.word)
+        prompt, unrevealed_words = self._guess_prompt(game_state, clue, number, correct_guesses,
+                                                      previous_guesses, board_context)
+        response_text = self.make_api_call(_GUESS_SYSTEM_MESSAGE, prompt)
+        return self._parse_guess(response_text, prompt, unrevealed_words)
+    
+    def _guess_prompt(self, game_state: GameState, clue: str, number: int,
+                      correct_guesses: int, previous_guesses: List[Dict],
+                      board_context: Optional[str] = None) -> Tuple[str, Tuple[str, ...]]:
+        """Build the guess prompt; returns (prompt, unrevealed words in lowercase)"""
+        if board_context is None:
+            board_context = format_board_context(game_state)
         
         # Format previous guesses for the prompt
         previous_guesses_text = ""
@@ -63,12 +140,6 @@ class OperativeAgent:
                 card_type = guess.get("revealed_type", "unknown")
                 previous_guesses_text += f"{i+1}. '{guess['word']}' - {result_text} (was a {card_type} card)\n"
         
-        # Format revealed words by type
-        revealed_by_type = {"red": [], "blue": [], "neutral": [], "assassin": []}
-        for card in game_state.board:
-            if card.revealed:
-                revealed_by_type[card.type.value].append(card.word)
-        
         # Create prompt with all context
         prompt = f"""
 You are the {self.team.value} Operative in a game of Codenames. Your Spymaster has given the clue:
@@ -77,16 +148,12 @@ You are the {self.team.value} Operative in a game of Codenames. Your Spymaster h
 This means there are {number} words on the board related to this clue that you should try to guess.
 
 Current board state:
-- Unrevealed words: {', '.join(unrevealed_words)}
-- Revealed Red Team words: {', '.join(revealed_by_type['red'])}
-- Revealed Blue Team words: {', '.join(revealed_by_type['blue'])}
-- Revealed Neutral words: {', '.join(revealed_by_type['neutral'])}
-- Revealed Assassin words: {', '.join(revealed_by_type['assassin'])}
+{board_context}
 
 Game situation:
 - You are on the {self.team.value.upper()} team
-- Red team has {board_state['red_remaining']} words remaining
-- Blue team has {board_state['blue_remaining']} words remaining
+- Red team has {game_state.red_remaining} words remaining
+- Blue team has {game_state.blue_remaining} words remaining
 - You have made {correct_guesses} correct guesses for this clue so far
 - You can make up to {number+1-correct_guesses} more guesses this turn
 {previous_guesses_text}
@@ -102,12 +169,10 @@ REASONING: [detailed explanation of your thought process]
 Choose the word that you believe has the strongest connection to the clue '{clue}',
 or 'end' if you want to end your turn.
 """
-        
-        response_text = self.make_api_call(
-            "You are a Codenames Operative AI. Your goal is to correctly identify words related to your Spymaster's clue.",
-            prompt
-        )
-        
+        return prompt, game_state.unrevealed_lower_words
+    
+    def _parse_guess(self, response_text: str, prompt: str, unrevealed_words: Sequence[str]) -> Tuple[str, str]:
+        """Parse and log a guess response; returns (guess_word, reasoning)"""
         # Parse the AI response
         decision_match = re.search(r"DECISION:\s*([^\n]+)", response_text, re.IGNORECASE)
         reasoning_match = re.search(r"REASONING:\s*(.*)", response_text, re.IGNORECASE | re.DOTALL)
@@ -154,16 +219,21 @@ or 'end' if you want to end your turn.
         return guess_word, reasoning
     
     def debate_response(self, debate_log: List[Dict[str, Any]], game_state: GameState, 
-                       clue: str, number: int) -> str:
-        """Generate a response to the ongoing debate"""
-        board_state = game_state.get_visible_state(self.team)
+                       clue: str, number: int, transcript: Optional[str] = None,
+                       board_context: Optional[str] = None) -> str:
+        """Generate a response to the ongoing debate
         
-        unrevealed_words = [card.word for card in game_state.board if not card.revealed]
+        transcript is debate_log already formatted with format_debate_entry; callers
+        that keep it up to date across turns save re-formatting the whole log here.
+        Likewise board_context is format_board_context(game_state).
+        """
+        if board_context is None:
+            board_context = format_board_context(game_state)
         
         # Construct debate summary
-        debate_summary = ""
-        for entry in debate_log:
-            debate_summary += f"{entry['agent']}: {entry['message'][:200]}...\n\n"
+        if transcript is None:
+            transcript = "".join(map(format_debate_entry, debate_log))
+        debate_summary = transcript
         
         prompt = f"""
 You are participating in a team debate for Codenames as the {self.team.value} Operative.
@@ -173,7 +243,7 @@ DEBATE SO FAR:
 {debate_summary}
 
 CURRENT BOARD:
-Unrevealed words: {', '.join(unrevealed_words)}
+{board_context}
 
 As a team member, respond to the ongoing debate. You should:
 1. State your current opinion about the best guess
@@ -194,8 +264,12 @@ Please keep your response under 200 words.
     def final_vote(self, debate_log: List[Dict[str, Any]], options: List[str], 
                   game_state: GameState, clue: str, number: int) -> str:
         """Cast a final vote on which word to guess"""
-        unrevealed_words = [card.word for card in game_state.board if not card.revealed]
-        
+        prompt = self._final_vote_prompt(debate_log, options, clue, number)
+        return self._parse_vote(self.make_api_call(_VOTE_SYSTEM_MESSAGE, prompt), options)
+    
+    def _final_vote_prompt(self, debate_log: List[Dict[str, Any]], options: List[str],
+                           clue: str, number: int) -> str:
+        """Build the final vote prompt"""
         # Construct debate summary - focus on the later rounds which are more important
         later_rounds = [entry for entry in debate_log if entry['round'] > 1]
         debate_summary = ""
@@ -221,11 +295,11 @@ Consider:
 You MUST vote for one of the exact options listed above.
 Respond with just the word you're voting for.
 """
-        
-        vote = self.make_api_call(
-            "You are a Codenames Operative making a final decision.",
-            prompt
-        ).strip().lower()
+        return prompt
+    
+    def _parse_vote(self, vote: str, options: List[str]) -> str:
+        """Normalize a vote response to one of the options, defaulting to 'end'"""
+        vote = vote.strip().lower()
         
         # Clean up potential formatting or quotes
         vote = vote.strip("'\".,!? ")
@@ -3,44 +3,137 @@ Spymaster AI agents for Codenames game.
 Contains AI implementations for the Spymaster role.
 """
 
+import hashlib
+import json
+import os
 import re
 import random
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Callable, Optional
 
-import openai
 from ..game import GameState, CardType
+from .api import chat_completion
+
+
+# Sampling temperature for clue generation; part of the clue cache key
+CLUE_TEMPERATURE = 0.7
+
+
+class ClueCache:
+    """
+    Spymaster responses persisted in a JSON file, keyed by the request sent.
+
+    Lets repeated runs over the same boards skip the language model call for
+    clues that were already generated. The file is loaded on first use and
+    rewritten atomically after every new entry.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self._entries: Optional[Dict[str, str]] = None
+
+    @staticmethod
+    def key(model: str, temperature: float, system_message: str, user_message: str) -> str:
+        """Hash of the exact request: model, temperature and both prompts"""
+        request = [model, temperature, system_message, user_message]
+        return hashlib.sha256(json.dumps(request).encode("utf-8")).hexdigest()
+
+    def _load(self) -> Dict[str, str]:
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None"""
+        return self._load().get(key)
+
+    def put(self, key: str, response: str):
+        """Store a response and write the cache file"""
+        entries = self._load()
+        entries[key] = response
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
 
 
 class SpymasterAgent:
     """AI agent that plays as a Spymaster"""
-    def __init__(self, name: str, team: CardType, model: str = "gpt-4o"):
+    def __init__(self, name: str, team: CardType, model: str = "gpt-4o",
+                 clue_cache: Optional[ClueCache] = None):
         self.name = name
         self.team = team
         self.role = "spymaster"
         self.model = model
+        # Optional cache of responses for board states seen before
+        self.clue_cache = clue_cache
         self.decisions: List[Dict[str, Any]] = []
     
     def make_api_call(self, system_message: str, user_message: str) -> str:
         """Make an API call to the language model"""
         try:
-            client = openai.OpenAI()
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
+            response = chat_completion(self.model, system_message, user_message,
+                                       temperature=CLUE_TEMPERATURE, max_tokens=500)
             return response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Error making API call: {e}")
             return f"Error: {str(e)[:100]}..."
     
-    def generate_clue(self, game_state: GameState) -> Tuple[str, int, List[str]]:
-        """Generate a clue based on the game state"""
-        board_state = game_state.get_spymaster_state(self.team)
+    def stream_api_call(self, system_message: str, user_message: str,
+                        on_text: Callable[[str], None]) -> str:
+        """Make a streaming API call, passing the response text so far to on_text after every chunk"""
+        try:
+            stream = chat_completion(self.model, system_message, user_message,
+                                     temperature=CLUE_TEMPERATURE, max_tokens=500, stream=True)
+            text = ""
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    text += chunk.choices[0].delta.content
+                    on_text(text)
+            return text.strip()
+        except Exception as e:
+            print(f"Error making API call: {e}")
+            return f"Error: {str(e)[:100]}..."
+    
+    @staticmethod
+    def _early_clue(on_clue: Callable[[str, int], None], emitted: List[Tuple[str, int]]) -> Callable[[str], None]:
+        """
+        Return an on_text callback that passes the clue word and number to on_clue
+        as soon as both lines are complete in the streamed response, once.
+        The emitted clue is appended to emitted.
+        """
+        def on_text(text: str):
+            if emitted:
+                return
+            clue_match = re.search(r"CLUE:\s*([\w\-]+)\s*\n", text, re.IGNORECASE)
+            number_match = re.search(r"NUMBER:\s*(\d+)\s*\n", text, re.IGNORECASE)
+            if clue_match and number_match:
+                emitted.append((clue_match.group(1).strip(), int(number_match.group(1))))
+                on_clue(*emitted[0])
+        return on_text
+    
+    def generate_clue(self, game_state: GameState,
+                      on_clue: Optional[Callable[[str, int], None]] = None) -> Tuple[str, int, List[str]]:
+        """
+        Generate a clue based on the game state
+        
+        Args:
+            game_state: Current game state
+            on_clue: Optional callback called once with the clue word and number. The
+                response is then streamed and on_clue runs as soon as both are received,
+                before the targets, so operatives can start on the clue early. The
+                returned number can still differ if it did not match the targets.
+        
+        Returns:
+            Tuple of (clue word, number, target words)
+        """
+        board_state = game_state.get_spymaster_state()
         
         # Gather words by type
         team_words = []
@@ -91,10 +184,23 @@ TARGETS: [word1], [word2], etc.
 The TARGETS must be words from your team's list above, and the NUMBER must match the count of TARGETS.
 """
         
-        response_text = self.make_api_call(
-            "You are a Codenames Spymaster AI focused on efficiency.", 
-            prompt
-        )
+        system_message = "You are a Codenames Spymaster AI focused on efficiency."
+        
+        cache_key = response_text = None
+        if self.clue_cache is not None:
+            cache_key = ClueCache.key(self.model, CLUE_TEMPERATURE, system_message, prompt)
+            response_text = self.clue_cache.get(cache_key)
+        
+        emitted: List[Tuple[str, int]] = []
+        if response_text is None:
+            if on_clue is None:
+                response_text = self.make_api_call(system_message, prompt)
+            else:
+                response_text = self.stream_api_call(system_message, prompt,
+                                                     self._early_clue(on_clue, emitted))
+            # Failed calls are not cached so the next run retries them
+            if cache_key is not None and not response_text.startswith("Error:"):
+                self.clue_cache.put(cache_key, response_text)
         
         # Extract clue, number, and targets
         clue_word = ""
@@ -157,6 +263,10 @@ The TARGETS must be words from your team's list above, and the NUMBER must match
             }
         })
         
+        # The clue was not seen early (cached or unexpected format)
+        if on_clue is not None and not emitted:
+            on_clue(clue_word, clue_number)
+        
         print(f"{self.name} gives clue: {clue_word}, Number: {clue_number}, Targets: {target_words}")
         return clue_word, clue_number, target_words
     
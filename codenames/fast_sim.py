@@ -0,0 +1,180 @@
+"""
+Batched game simulation for Codenames self-play.
+Boards are NumPy int8 arrays of card type codes, so thousands of games can be
+played per call without creating GameState or Card objects. GameEngine remains
+the reference implementation used by the UI and the agents.
+"""
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the kernels then run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+from .game import CardType, _CARD_TYPE_CODE
+
+
+# Card type codes, shared with codenames.game
+RED = _CARD_TYPE_CODE[CardType.RED]
+BLUE = _CARD_TYPE_CODE[CardType.BLUE]
+NEUTRAL = _CARD_TYPE_CODE[CardType.NEUTRAL]
+ASSASSIN = _CARD_TYPE_CODE[CardType.ASSASSIN]
+NO_WINNER = -1
+
+# Guess value meaning "end the turn" in a guess sequence
+END_TURN = -1
+
+# Card type layouts before shuffling, for RED and BLUE going first
+_RED_FIRST = np.array([RED] * 9 + [BLUE] * 8 + [NEUTRAL] * 7 + [ASSASSIN], dtype=np.int8)
+_BLUE_FIRST = np.array([RED] * 8 + [BLUE] * 9 + [NEUTRAL] * 7 + [ASSASSIN], dtype=np.int8)
+
+
+def random_boards(n_games: int, seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generate random board layouts for a batch of games.
+
+    Args:
+        n_games: Number of boards to generate
+        seed: Seed for np.random.default_rng (None for random)
+
+    Returns:
+        Tuple of (board_types, first_team): an (n_games, 25) int8 array of card
+        type codes and an (n_games,) int8 array with the team that starts.
+    """
+    rng = np.random.default_rng(seed)
+    first_team = rng.integers(RED, BLUE + 1, size=n_games, dtype=np.int8)
+    layouts = np.where((first_team == RED)[:, None], _RED_FIRST, _BLUE_FIRST)
+    board_types = rng.permuted(layouts, axis=1).astype(np.int8)
+    return board_types, first_team
+
+
+@njit(cache=True, nogil=True)
+def apply_guess(board_types, board_revealed, idx, current_team, red_remaining, blue_remaining):
+    """
+    Apply one guess to a single board, in place.
+
+    The array counterpart of GameEngine.process_guess_result: reveals the card,
+    updates the remaining counts, and works out the winner and the team to play next.
+
+    Args:
+        board_types: (25,) int8 array of card type codes
+        board_revealed: (25,) bool array, updated in place
+        idx: Board index of the guessed card
+        current_team: Code of the guessing team
+        red_remaining: Unrevealed red cards before the guess
+        blue_remaining: Unrevealed blue cards before the guess
+
+    Returns:
+        Tuple of (success, red_remaining, blue_remaining, winner, next_team).
+        success is False (and nothing changes) if the card was already revealed;
+        winner is NO_WINNER while the game goes on.
+    """
+    if idx < 0 or board_revealed[idx]:
+        return False, red_remaining, blue_remaining, NO_WINNER, current_team
+
+    board_revealed[idx] = True
+    card_type = board_types[idx]
+    other_team = BLUE if current_team == RED else RED
+    winner = NO_WINNER
+    if card_type == ASSASSIN:
+        winner = other_team
+    elif card_type == RED:
+        red_remaining -= 1
+        if red_remaining == 0:
+            winner = RED
+    elif card_type == BLUE:
+        blue_remaining -= 1
+        if blue_remaining == 0:
+            winner = BLUE
+
+    # Only continue the turn if the team guessed one of its own cards
+    next_team = current_team if card_type == current_team else other_team
+    return True, red_remaining, blue_remaining, winner, next_team
+
+
+@njit(cache=True, nogil=True, parallel=True)
+def simulate(board_types, first_team, guesses):
+    """
+    Play a batch of games from pre-computed guess sequences.
+
+    Follows the same rules as GameEngine.process_guess / end_turn: a team keeps
+    guessing while it reveals its own cards, any other card ends the turn, the
+    assassin loses the game, and revealing a team's last card wins it for them.
+    Guesses of already revealed cards are ignored.
+
+    Args:
+        board_types: (n_games, 25) int8 array of card type codes
+        first_team: (n_games,) int8 array with the starting team code
+        guesses: (n_games, n_moves) int32 array of board indices in play order;
+                 END_TURN (-1) ends the current team's turn
+
+    Returns:
+        Tuple of (winners, turn_counts, revealed): winner team code per game
+        (NO_WINNER if undecided), turns played per game, and the final
+        (n_games, 25) revealed mask.
+    """
+    n_games = board_types.shape[0]
+    n_moves = guesses.shape[1]
+    winners = np.full(n_games, NO_WINNER, dtype=np.int8)
+    turn_counts = np.zeros(n_games, dtype=np.int32)
+    revealed = np.zeros(board_types.shape, dtype=np.bool_)
+
+    for g in prange(n_games):
+        team = first_team[g]
+        red_remaining = 0
+        blue_remaining = 0
+        for i in range(board_types.shape[1]):
+            if board_types[g, i] == RED:
+                red_remaining += 1
+            elif board_types[g, i] == BLUE:
+                blue_remaining += 1
+
+        winner = NO_WINNER
+        turn_count = 0
+        for m in range(n_moves):
+            idx = guesses[g, m]
+            if idx == END_TURN:
+                turn_count += 1
+                team = BLUE if team == RED else RED
+                continue
+
+            _, red_remaining, blue_remaining, winner, next_team = apply_guess(
+                board_types[g], revealed[g], idx, team, red_remaining, blue_remaining)
+            if next_team != team:
+                turn_count += 1
+                team = next_team
+            if winner != NO_WINNER:
+                break
+
+        winners[g] = winner
+        turn_counts[g] = turn_count
+
+    return winners, turn_counts, revealed
+
+
+def simulate_batch(n_games: int,
+                   policy_fn: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                   seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Generate a batch of boards, ask a policy for guess sequences, and play them.
+
+    Args:
+        n_games: Number of games to simulate
+        policy_fn: Called as policy_fn(board_types, first_team); must return an
+                   (n_games, n_moves) integer array of guesses (see simulate)
+        seed: Seed for board generation (None for random)
+
+    Returns:
+        Tuple of (winners, turn_counts, revealed) as returned by simulate.
+    """
+    board_types, first_team = random_boards(n_games, seed)
+    guesses = np.ascontiguousarray(policy_fn(board_types, first_team), dtype=np.int32)
+    return simulate(board_types, first_team, guesses)
@@ -3,13 +3,14 @@ Core game logic for Codenames.
 This module contains all the core game mechanics, data structures, and rules.
 """
 
-from dataclasses import dataclass, field, replace, asdict
+from array import array
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Union, Any
-import uuid
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union, Any
 import random
+import threading
 import time
-import copy
+from secrets import randbits, token_hex
 
 
 class CardType(Enum):
@@ -21,7 +22,43 @@ class CardType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Upper-case names of the card types, used in display text
+_TYPE_UPPER = {t: t.value.upper() for t in CardType}
+
+# Small integer codes for compact (byte/array) board encodings.
+# CardType itself keeps its string values, which are part of the public API.
+_CARD_TYPE_CODE = {
+    CardType.RED: 0,
+    CardType.BLUE: 1,
+    CardType.NEUTRAL: 2,
+    CardType.ASSASSIN: 3,
+    CardType.UNKNOWN: 0xF,
+}
+_CODE_CARD_TYPE = {code: card_type for card_type, code in _CARD_TYPE_CODE.items()}
+_REVEALED_BIT = 0x80
+
+# The other team, for turn hand-over and assassin losses
+_OPPOSING = {CardType.RED: CardType.BLUE, CardType.BLUE: CardType.RED}
+
+# GameState counter decremented when a team's card is revealed
+_REMAINING_ATTR = {CardType.RED: "red_remaining", CardType.BLUE: "blue_remaining"}
+
+# Card types of a new board before shuffling, by starting team (which gets 9 cards)
+_CARD_TYPE_LAYOUT = {
+    first_team: tuple([CardType.RED] * (9 if first_team == CardType.RED else 8) +
+                      [CardType.BLUE] * (9 if first_team == CardType.BLUE else 8) +
+                      [CardType.NEUTRAL] * 7 +
+                      [CardType.ASSASSIN])
+    for first_team in (CardType.RED, CardType.BLUE)
+}
+
+# Board cell labels used by board2str
+_TYPE_LABEL = {t: f"[{upper}]" for t, upper in _TYPE_UPPER.items()}
+# board2str labels for hidden cards, by board position
+_INDEX_LABEL = tuple(f"[{k + 1}]" for k in range(25))
+
+
+@dataclass(slots=True)
 class Card:
     """Represents a single card in the Codenames game"""
     word: str
@@ -29,7 +66,7 @@ class Card:
     revealed: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     """Represents a player in the game"""
     id: str
@@ -39,7 +76,45 @@ class Player:
     is_ai: bool = False
 
 
-@dataclass
+class Clue(NamedTuple):
+    """A clue given by a spymaster, as stored in GameState.clue_history"""
+    team: CardType
+    word: str
+    count: int
+    targets: List[str]
+
+
+class Guess(NamedTuple):
+    """A guess made by an operative, as stored in GameState.guess_history"""
+    team: CardType
+    word: str
+    correct: bool
+
+
+class GuessResult(NamedTuple):
+    """Outcome of GameEngine.process_guess_result"""
+    success: bool
+    card_type: Optional[str] = None  # CardType value of the revealed card
+    end_turn: bool = False
+    game_over: bool = False
+    winner: Optional[str] = None  # CardType value of the winning team
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The result dict returned by GameEngine.process_guess."""
+        if not self.success:
+            return {"success": False, "error": self.error}
+        result = {"success": True, "card_type": self.card_type, "end_turn": self.end_turn}
+        if self.game_over:
+            result["game_over"] = True
+            result["winner"] = self.winner
+        return result
+
+
+_GUESS_NOT_FOUND = GuessResult(False, error="Card not found or already revealed")
+
+
+@dataclass(slots=True)
 class GameState:
     """Represents the current state of a Codenames game"""
     game_id: str
@@ -49,23 +124,122 @@ class GameState:
     current_team: CardType  # RED or BLUE
     winner: Optional[CardType] = None
     turn_count: int = 0
-    clue_history: List[Tuple[CardType, str, int]] = field(default_factory=list)
-    guess_history: List[Tuple[CardType, str, bool]] = field(default_factory=list)
     random_seed: Optional[int] = None
+    # Clue and guess history, stored column-wise (one list per attribute). The
+    # columns are append-only; clue_history/guess_history are read-only row views.
+    clue_teams: List[CardType] = field(default_factory=list)
+    clue_words: List[str] = field(default_factory=list)
+    clue_counts: List[int] = field(default_factory=list)
+    clue_targets: List[List[str]] = field(default_factory=list)
+    guess_teams: List[CardType] = field(default_factory=list)
+    guess_words: List[str] = field(default_factory=list)
+    guess_correct: List[bool] = field(default_factory=list)
+    # Per-card lookups derived from `board` (see _build_board_indices). `board`
+    # stays the public view; cards on it are revealed through reveal(), which
+    # keeps board_revealed in sync.
+    board_words_lower: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    board_words_lower_set: frozenset = field(default=frozenset(), init=False, repr=False, compare=False)
+    word_index: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    board_types: array = field(default_factory=lambda: array('b'), init=False, repr=False, compare=False)
+    board_revealed: bytearray = field(default_factory=bytearray, init=False, repr=False, compare=False)
+    # Cache for unrevealed_lower_words, cleared whenever a card is revealed
+    _unrevealed_lower: Optional[Tuple[str, ...]] = field(default=None, init=False, repr=False, compare=False)
+    # Rows of clue_history/guess_history built so far, extended as the columns grow
+    _clue_rows: List[Clue] = field(default_factory=list, init=False, repr=False, compare=False)
+    _guess_rows: List[Guess] = field(default_factory=list, init=False, repr=False, compare=False)
     
+    def __post_init__(self):
+        self._build_board_indices()
+    
+    def _build_board_indices(self) -> None:
+        """Build the lowercase word lookups and the type/revealed arrays from `board`."""
+        self.board_words_lower = [card.word.lower() for card in self.board]
+        self.board_words_lower_set = frozenset(self.board_words_lower)
+        self.word_index = {}
+        for i, word in enumerate(self.board_words_lower):
+            self.word_index.setdefault(word, i)
+        self.board_types = array('b', [_CARD_TYPE_CODE[card.type] for card in self.board])
+        self.board_revealed = bytearray(card.revealed for card in self.board)
+        self._unrevealed_lower = None
+    
+    def reveal(self, idx: int, revealed: bool = True) -> None:
+        """Set whether the card at board index idx is revealed, in the card and in board_revealed."""
+        self.board[idx].revealed = revealed
+        self.board_revealed[idx] = revealed
+        self._unrevealed_lower = None
+    
+    @property
+    def unrevealed_lower_words(self) -> Tuple[str, ...]:
+        """Lowercase words of the unrevealed cards, in board order (cached until the next reveal)."""
+        if self._unrevealed_lower is None:
+            self._unrevealed_lower = tuple(
+                word for word, revealed in zip(self.board_words_lower, self.board_revealed) if not revealed
+            )
+        return self._unrevealed_lower
+    
+    @property
+    def clue_history(self) -> List[Clue]:
+        """Clue history as Clue(team, word, count, targets) rows.
+
+        Read-only: clues are recorded by appending to the clue_* columns. The rows
+        are cached, and only those of clues added since the last access are built.
+        """
+        rows = self._clue_rows
+        if len(rows) > len(self.clue_words):
+            rows.clear()
+        if len(rows) < len(self.clue_words):
+            start = len(rows)
+            rows.extend(map(Clue, self.clue_teams[start:], self.clue_words[start:],
+                            self.clue_counts[start:], self.clue_targets[start:]))
+        return rows
+    
+    @property
+    def guess_history(self) -> List[Guess]:
+        """Guess history as Guess(team, word, correct) rows.
+
+        Read-only: guesses are recorded by appending to the guess_* columns. Cached
+        like clue_history.
+        """
+        rows = self._guess_rows
+        if len(rows) > len(self.guess_words):
+            rows.clear()
+        if len(rows) < len(self.guess_words):
+            start = len(rows)
+            rows.extend(map(Guess, self.guess_teams[start:], self.guess_words[start:],
+                            self.guess_correct[start:]))
+        return rows
     
     def __str__(self) -> str:
         return board2str(self)
     
     
     def to_dict(self) -> Dict:
-        """Converts the GameState to a dictionary for serialization."""
-        return asdict(self)
+        """Converts the GameState to a dictionary for serialization.
+
+        Built by hand rather than with dataclasses.asdict, which deep-copies
+        every field. Enum values are kept as CardType members, as asdict did.
+        """
+        return {
+            "game_id": self.game_id,
+            "board": [{"word": card.word, "type": card.type, "revealed": card.revealed} for card in self.board],
+            "red_remaining": self.red_remaining,
+            "blue_remaining": self.blue_remaining,
+            "current_team": self.current_team,
+            "winner": self.winner,
+            "turn_count": self.turn_count,
+            "random_seed": self.random_seed,
+            # History as rows, as asdict gave it; target lists are copied like asdict did
+            "clue_history": list(map(Clue, self.clue_teams, self.clue_words, self.clue_counts,
+                                     map(list, self.clue_targets))),
+            "guess_history": list(self.guess_history),
+        }
         
-    def get_visible_state(self, team: CardType) -> 'GameState':
-        """Returns the game state as visible to a specific team's operatives.
+    def get_visible_state(self, team: Optional[CardType] = None) -> 'GameState':
+        """Returns the game state as visible to operatives.
         
         Creates a new GameState object with appropriate information hidden for operatives.
+        Both teams' operatives see the same board, so team is ignored; it is only
+        accepted for compatibility with older callers.
         """
         # Create new cards for the visible board
         visible_board = []
@@ -86,15 +260,66 @@ class GameState:
                 ))
 
         # Create a new GameState with the visible board
-        return replace(self, board=visible_board) 
+        return replace(self, board=visible_board, **self._copy_history())
     
-    def get_spymaster_state(self, team: CardType) -> 'GameState':
-        """Returns the game state as visible to a spymaster of a specific team.
+    def get_spymaster_state(self, team: Optional[CardType] = None) -> 'GameState':
+        """Returns the game state as visible to a spymaster.
         
         Creates a new GameState object with all information visible (spymasters see everything).
+        team is ignored and only accepted for compatibility with older callers.
         """
-        # Create a deep copy of the cards to avoid modifying the original
-        return copy.deepcopy(self)
+        # Copy the cards and history so the original can't be modified.
+        # Card fields are immutable values, so a shallow rebuild is enough.
+        board = [Card(card.word, card.type, card.revealed) for card in self.board]
+        return replace(self, board=board, **self._copy_history())
+    
+    def _copy_history(self) -> Dict[str, list]:
+        """Returns copies of the history columns, for building independent states."""
+        return {
+            "clue_teams": list(self.clue_teams),
+            "clue_words": list(self.clue_words),
+            "clue_counts": list(self.clue_counts),
+            "clue_targets": [list(targets) for targets in self.clue_targets],
+            "guess_teams": list(self.guess_teams),
+            "guess_words": list(self.guess_words),
+            "guess_correct": list(self.guess_correct),
+        }
+
+    def get_visible_state_bytes(self, team: Optional[CardType] = None) -> bytes:
+        """Returns the operative view of the board as one byte per card.
+        team is ignored, as in get_visible_state.
+
+        The low nibble holds the card type code (see _CARD_TYPE_CODE), or the
+        UNKNOWN code for unrevealed cards; bit 0x80 marks revealed cards.
+        """
+        unknown = _CARD_TYPE_CODE[CardType.UNKNOWN]
+        buf = bytearray(len(self.board))
+        for i, card in enumerate(self.board):
+            if card.revealed:
+                buf[i] = _CARD_TYPE_CODE[card.type] | _REVEALED_BIT
+            else:
+                buf[i] = unknown
+        return bytes(buf)
+
+    def count_unrevealed(self, card_type: CardType) -> int:
+        """Count the unrevealed cards of a type, from the board_types/board_revealed columns.
+
+        For team cards this matches red_remaining / blue_remaining.
+        """
+        code = _CARD_TYPE_CODE[card_type]
+        return sum(1 for t, revealed in zip(self.board_types, self.board_revealed) if t == code and not revealed)
+
+    def unrevealed_words(self, card_type: CardType) -> List[str]:
+        """Words of the unrevealed cards of a type, in board order, from the board columns."""
+        code = _CARD_TYPE_CODE[card_type]
+        board = self.board
+        return [board[i].word for i, (t, revealed) in enumerate(zip(self.board_types, self.board_revealed))
+                if t == code and not revealed]
+
+    def card_for_word(self, word: str) -> Optional[Card]:
+        """The card with this word (case-insensitive), looked up in word_index, or None."""
+        idx = self.word_index.get(word.lower())
+        return self.board[idx] if idx is not None else None
 
     def is_game_over(self) -> bool:
         """Check if the game is over."""
@@ -112,51 +337,75 @@ class GameEngine:
         """Initialize the game engine with a list of words to use."""
         self.games: Dict[str, GameState] = {}
         self.word_list = word_list
+        # One random.Random per thread, reseeded for every game
+        self._rng = threading.local()
         
     def create_game(self, red_team_size: int = 2, blue_team_size: int = 2, seed = None) -> str:
         """Create a new game with the specified team sizes."""
         # Validate inputs
         assert red_team_size > 0, "Red team size must be positive"
         assert blue_team_size > 0, "Blue team size must be positive"
+        assert len(self.word_list) >= 25, "Word list must contain at least 25 words"
         
         if seed is None:
             # current timestamp
             seed = int(time.time())
-
         
-        game_id = str(uuid.uuid4())[:8]
+        return self._add_game(self._local_random(), seed)
+    
+    def create_games_batch(self, n_games: int, seeds: Optional[List[int]] = None) -> List[str]:
+        """
+        Create many games at once, e.g. for self-play training.
+        
+        Each game is seeded individually, so create_games_batch(n, seeds) builds the
+        same boards as calling create_game(seed=s) for each seed.
         
-        # Create a local random number generator instead of using the global random state
-        # This makes the method thread-safe and reproducible in parallel environments
-        local_random = random.Random(seed)
+        Args:
+            n_games: Number of games to create
+            seeds: One seed per game (random seeds if None)
+            
+        Returns:
+            List of the new game IDs
+        """
+        assert len(self.word_list) >= 25, "Word list must contain at least 25 words"
+        if seeds is None:
+            seeds = [randbits(32) for _ in range(n_games)]
+        assert len(seeds) == n_games, "Expected one seed per game"
+        
+        local_random = self._local_random()
+        return [self._add_game(local_random, seed) for seed in seeds]
+    
+    def _local_random(self) -> random.Random:
+        """Get this thread's random number generator."""
+        # Use a thread-local random number generator instead of the global random state.
+        # This keeps the engine thread-safe and reproducible in parallel environments,
+        # while reusing the generator's state buffer across games.
+        local_random = getattr(self._rng, 'r', None)
+        if local_random is None:
+            local_random = self._rng.r = random.Random()
+        return local_random
+    
+    def _add_game(self, local_random: random.Random, seed) -> str:
+        """Build a board from the given seed and register the new game."""
+        game_id = token_hex(4)
+        local_random.seed(seed)
         
         # Create board using local random generator
-        assert len(self.word_list) >= 25, "Word list must contain at least 25 words"
         words = local_random.sample(self.word_list, 25)
-        board = []
         
         # Determine first team
         first_team = local_random.choice([CardType.RED, CardType.BLUE])
-        first_team_count = 9
-        second_team_count = 8
         
         # Assign card types
-        card_types = ([CardType.RED] * (first_team_count if first_team == CardType.RED else second_team_count) +
-                      [CardType.BLUE] * (first_team_count if first_team == CardType.BLUE else second_team_count) +
-                      [CardType.NEUTRAL] * 7 +
-                      [CardType.ASSASSIN])
+        card_types = list(_CARD_TYPE_LAYOUT[first_team])
         local_random.shuffle(card_types)
         
-        # Create board
-        for i in range(25):
-            board.append(Card(word=words[i], type=card_types[i]))
-        
         # Create game state
         game_state = GameState(
             game_id=game_id,
-            board=board,
-            red_remaining=first_team_count if first_team == CardType.RED else second_team_count,
-            blue_remaining=first_team_count if first_team == CardType.BLUE else second_team_count,
+            board=[Card(word=word, type=card_type) for word, card_type in zip(words, card_types)],
+            red_remaining=9 if first_team == CardType.RED else 8,
+            blue_remaining=9 if first_team == CardType.BLUE else 8,
             current_team=first_team,
             random_seed=seed
         )
@@ -181,13 +430,29 @@ class GameEngine:
                 - is_valid: Boolean indicating if the clue is valid
                 - error: Error message if the clue is invalid, None otherwise
         """
-        # Validate parameter types
+        # Cheap checks first, so clues submitted on the wrong turn or after the
+        # game has ended are rejected before any string work
         if not isinstance(game, GameState):
             return {
                 'is_valid': False,
                 'error': f"Expected GameState for game, got {type(game).__name__}"
             }
             
+        if not isinstance(team, CardType):
+            return {
+                'is_valid': False,
+                'error': f"Expected CardType for team, got {type(team).__name__}"
+            }
+        
+        # Turn and game-over checks, before any string work
+        error = self._turn_error(game, team)
+        if error is not None:
+            return {
+                'is_valid': False,
+                'error': error
+            }
+            
+        # Validate remaining parameter types
         if not isinstance(clue_word, str):
             return {
                 'is_valid': False,
@@ -205,159 +470,162 @@ class GameEngine:
                 'is_valid': False,
                 'error': "All selected cards must be strings"
             }
-            
-        if not isinstance(team, CardType):
-            return {
-                'is_valid': False,
-                'error': f"Expected CardType for team, got {type(team).__name__}"
-            }
         
+        error = self._clue_error(game, clue_word, selected_cards)
+        return {
+            'is_valid': error is None,
+            'error': error
+        }
+    
+    def validate_clue_trusted(self, game: GameState, clue_word: str, selected_cards: List[str],
+                              team: CardType) -> Optional[str]:
+        """
+        Validate a clue from a caller that already passes correctly typed arguments.
+        
+        Applies the game rules of validate_clue without its type checks, for
+        AI/self-play loops. External input should go through validate_clue.
+        
+        Returns:
+            None if the clue is valid, otherwise the error message
+        """
+        error = self._turn_error(game, team)
+        if error is not None:
+            return error
+        return self._clue_error(game, clue_word, selected_cards)
+    
+    @staticmethod
+    def _turn_error(game: GameState, team: CardType) -> Optional[str]:
+        """Error message if the team can't give a clue now (not its turn, or the game is over), else None"""
         # Check if it's the team's turn
         if game.current_team != team:
-            return {
-                'is_valid': False,
-                'error': f"It's not {team.value} team's turn"
-            }
+            return f"It's not {team.value} team's turn"
             
         # Check if the game is already won
         if game.winner:
-            return {
-                'is_valid': False, 
-                'error': f"Game is already over. Winner: {game.winner.value}"
-            }
-            
+            return f"Game is already over. Winner: {game.winner.value}"
+        return None
+    
+    @staticmethod
+    def _clue_error(game: GameState, clue_word: str, selected_cards: List[str]) -> Optional[str]:
+        """Error message if the clue itself breaks the rules, else None"""
         # Ensure clue word is a single word
         if not clue_word or len(clue_word.split()) > 1:
-            return {
-                'is_valid': False,
-                'error': "Clue must be a single word"
-            }
+            return "Clue must be a single word"
             
         # Check if the clue word appears on the board (not allowed by rules)
-        board_words = [card.word.lower() for card in game.board]
+        board_words = game.board_words_lower_set
         if clue_word.lower() in board_words:
-            return {
-                'is_valid': False,
-                'error': f"Clue cannot be a word that appears on the board"
-            }
+            return "Clue cannot be a word that appears on the board"
             
         # Check if selected cards exist on the board
         for card_word in selected_cards:
             if card_word.lower() not in board_words:
-                return {
-                    'is_valid': False,
-                    'error': f"Card '{card_word}' does not exist on the board"
-                }
+                return f"Card '{card_word}' does not exist on the board"
                 
         # Check for duplicate cards in selection
         if len(selected_cards) != len(set(selected_cards)):
-            return {
-                'is_valid': False,
-                'error': "Duplicate cards in selection"
-            }
+            return "Duplicate cards in selection"
             
         # The clue is valid
-        return {
-            'is_valid': True,
-            'error': None
-        }
-        
-    def process_clue(self, game_id: str, clue_word: str, selected_cards: List[str], team: CardType) -> bool:
-        """Process a clue from a spymaster."""
-        game = self.games.get(game_id)
-        assert game is not None
+        return None
+
+    def process_clue(self, game_id: str, clue_word: str, selected_cards: List[str], team: CardType,
+                     trusted: bool = False) -> bool:
+        """Process a clue from a spymaster.
+
+        Set trusted=True when the arguments are known to be correctly typed
+        (e.g. AI self-play) to skip validate_clue's type checks.
+        Raises KeyError if game_id is unknown, ValueError if the clue is invalid.
+        """
+        game = self.games[game_id]
         
-        validation_result = self.validate_clue(game, clue_word, selected_cards, team)
+        if trusted:
+            error = self.validate_clue_trusted(game, clue_word, selected_cards, team)
+        else:
+            error = self.validate_clue(game, clue_word, selected_cards, team)['error']
         
-        if not validation_result['is_valid']:
-            raise ValueError(validation_result['error'])
-    
-        if game.current_team != team or game.winner:
-            return False
+        if error is not None:
+            raise ValueError(error)
         
         # Add to clue history
-        game.clue_history.append((team, clue_word, len(selected_cards), selected_cards))
+        game.clue_teams.append(team)
+        game.clue_words.append(clue_word)
+        game.clue_counts.append(len(selected_cards))
+        game.clue_targets.append(selected_cards)
         return True
     
     def process_guess(self, game_id: str, guess_word: str, team: CardType) -> Optional[Dict]:
-        """Process a guess from an operative."""
-        game = self.games.get(game_id)
-        assert game is not None
+        """Process a guess from an operative.
+
+        Returns None if it's not the team's turn or the game is over, otherwise
+        the result as a dict (see GuessResult.to_dict).
+        Raises KeyError if game_id is unknown.
+        """
+        result = self.process_guess_result(game_id, guess_word, team)
+        return result.to_dict() if result is not None else None
+    
+    def process_guess_result(self, game_id: str, guess_word: str, team: CardType) -> Optional[GuessResult]:
+        """Process a guess from an operative, returning a GuessResult.
+
+        Same as process_guess without building a result dict, for AI/self-play loops.
+        Raises KeyError if game_id is unknown.
+        """
+        game = self.games[game_id]
             
         if game.current_team != team or game.winner:
             return None
         
         # Find the card
-        guessed_card = None
-        for card in game.board:
-            if card.word.lower() == guess_word.lower() and not card.revealed:
-                guessed_card = card
-                break
-                
-        if not guessed_card:
-            return {"success": False, "error": "Card not found or already revealed"}
+        idx = game.word_index.get(guess_word.lower())
+        if idx is None or game.board_revealed[idx]:
+            return _GUESS_NOT_FOUND
         
         # Reveal the card
-        guessed_card.revealed = True
+        game.reveal(idx)
+        guessed_card = game.board[idx]
         
-        # Update counts and check winner
+        # Update counts and check winner.
+        # Only continue the turn if the team guessed one of its own cards.
         card_type = guessed_card.type
-        end_turn = True
-        result = {
-            "success": True, 
-            "card_type": card_type.value, 
-            "end_turn": True
-        }
+        correct_guess = card_type == team
+        end_turn = not correct_guess
         
         if card_type == CardType.ASSASSIN:
             # Game over, current team loses
-            game.winner = CardType.RED if team == CardType.BLUE else CardType.BLUE
-            result["game_over"] = True
-            result["winner"] = game.winner.value
-            result["end_turn"] = True
-            
-        elif card_type == CardType.RED:
-            game.red_remaining -= 1
-            if game.red_remaining == 0:
-                game.winner = CardType.RED
-                result["game_over"] = True
-                result["winner"] = CardType.RED.value
-            # Only continue turn if correct team guessed their own card
-            end_turn = team != CardType.RED
-            result["end_turn"] = end_turn
-            
-        elif card_type == CardType.BLUE:
-            game.blue_remaining -= 1
-            if game.blue_remaining == 0:
-                game.winner = CardType.BLUE
-                result["game_over"] = True
-                result["winner"] = CardType.BLUE.value
-            # Only continue turn if correct team guessed their own card
-            end_turn = team != CardType.BLUE
-            result["end_turn"] = end_turn
+            game.winner = _OPPOSING[team]
+        elif card_type in _REMAINING_ATTR:
+            remaining_attr = _REMAINING_ATTR[card_type]
+            remaining = getattr(game, remaining_attr) - 1
+            setattr(game, remaining_attr, remaining)
+            if remaining == 0:
+                game.winner = card_type
         
-        # Add to guess history - tuple of (team, word, correct_guess)
-        correct_guess = (team == CardType.RED and card_type == CardType.RED) or \
-                        (team == CardType.BLUE and card_type == CardType.BLUE)
-        game.guess_history.append((team, guess_word, correct_guess))
+        # Add to guess history - columns of (team, word, correct_guess)
+        game.guess_teams.append(team)
+        game.guess_words.append(guess_word)
+        game.guess_correct.append(correct_guess)
         
         # End turn if needed
         if end_turn:
             game.turn_count += 1
-            game.current_team = CardType.RED if game.current_team == CardType.BLUE else CardType.BLUE
+            game.current_team = _OPPOSING[game.current_team]
         
-        return result
+        if game.winner:
+            return GuessResult(True, guessed_card.type.value, end_turn, True, game.winner.value)
+        return GuessResult(True, guessed_card.type.value, end_turn)
     
     def end_turn(self, game_id: str, team: CardType) -> bool:
-        """End the current team's turn."""
-        game = self.games.get(game_id)
-        assert game is not None
+        """End the current team's turn.
+
+        Raises KeyError if game_id is unknown.
+        """
+        game = self.games[game_id]
             
         if game.current_team != team or game.winner:
             return False
             
         game.turn_count += 1
-        game.current_team = CardType.RED if game.current_team == CardType.BLUE else CardType.BLUE
+        game.current_team = _OPPOSING[game.current_team]
         return True
     
     def get_game(self, game_id: str) -> Optional[GameState]:
@@ -380,52 +648,46 @@ def board2str(game_state: GameState, show_all: bool = True):
     result = []
     result.append("\n" + "=" * 50)
     result.append(f"GAME: {game_state.game_id} {game_state.random_seed=}")
-    result.append(f"Turn: {game_state.turn_count + 1}, Current Team: {game_state.current_team.value.upper()}")
+    result.append(f"Turn: {game_state.turn_count + 1}, Current Team: {_TYPE_UPPER[game_state.current_team]}")
     result.append(f"RED remaining: {game_state.red_remaining}, BLUE remaining: {game_state.blue_remaining}")
     result.append("=" * 50)
     
-    # Determine maximum word length for formatting
-    max_length = max(len(card.word) for card in game_state.board)
-    
-    # Display the board as a 5x5 grid
+    # Determine column width for formatting, and pad the status labels once
+    pad = max(len(card.word) for card in game_state.board) + 2
+    type_cells = {card_type: label.ljust(pad) for card_type, label in _TYPE_LABEL.items()}
+
+    # Display the board as a 5x5 grid, one joined string per row
     for i in range(0, 25, 5):
         row = game_state.board[i:i+5]
-        
-        # First, print the word row
-        word_row = ""
-        for j, card in enumerate(row):
-            word = card.word.ljust(max_length + 2)
-            word_row += f"{word} "
-        result.append(word_row)
-        
-        # Then, print the card type / status row
-        status_row = ""
-        for j, card in enumerate(row):
-            if card.revealed or show_all:
-                status = f"[{card.type.value.upper()}]".ljust(max_length + 2)
-            else:
-                status = f"[{j+i+1}]".ljust(max_length + 2)
-            status_row += f"{status} "
-        result.append(status_row + "\n")
+
+        # First, the word row
+        result.append(" ".join(card.word.ljust(pad) for card in row))
+
+        # Then, the card type / status row
+        result.append(" ".join(
+            type_cells[card.type] if card.revealed or show_all else _INDEX_LABEL[i+j].ljust(pad)
+            for j, card in enumerate(row)
+        ) + "\n")
     
     # Display recent history
-    if game_state.clue_history:
-        last_clue = game_state.clue_history[-1]
+    if game_state.clue_words:
+        last_clue = (game_state.clue_teams[-1], game_state.clue_words[-1], game_state.clue_counts[-1])
         # Make the team name more readable
         team_name = last_clue[0]
         if hasattr(team_name, 'value'):
-            team_name = f"{team_name.value.upper()} Team"
+            team_name = f"{_TYPE_UPPER[team_name]} Team"
         result.append(f"Last clue: '{last_clue[1]}' {last_clue[2]} (by {team_name})")
     
-    if game_state.guess_history:
+    if game_state.guess_words:
         result.append("Recent guesses:")
-        for i in range(min(3, len(game_state.guess_history))):
-            guess = game_state.guess_history[-(i+1)]
+        recent_guesses = list(zip(game_state.guess_teams[-3:], game_state.guess_words[-3:],
+                                  game_state.guess_correct[-3:]))
+        for guess in reversed(recent_guesses):
             
             # Make the team name more readable
             team = guess[0]
             if hasattr(team, 'value'):
-                team_name = f"{team.value.upper()} Team"
+                team_name = f"{_TYPE_UPPER[team]} Team"
             else:
                 team_name = str(team)
             
@@ -437,8 +699,8 @@ def board2str(game_state: GameState, show_all: bool = True):
             elif isinstance(guess[2], bool):
                 # If it's a boolean, it's probably a result flag, so get the card_type from the result dict
                 # In this case, we'll just display the word's actual card type
-                card = next((c for c in game_state.board if c.word == guess[1] and c.revealed), None)
-                card_type = card.type.value if card else "unknown"
+                card = game_state.card_for_word(guess[1])
+                card_type = card.type.value if card is not None and card.revealed else "unknown"
             else:
                 card_type = str(guess[2])
                 
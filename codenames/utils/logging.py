@@ -5,21 +5,81 @@ Provides structured logging for game sessions, AI decisions, and debug informati
 
 import os
 import json
+import atexit
 import logging
+import queue
+import time
+import weakref
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
+from enum import Enum
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode values the stdlib json module can't handle (enums, datetimes)"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _dumps_line(event: Dict[str, Any]) -> bytes:
+    """Serialize an event as one NDJSON line"""
+    if orjson is not None:
+        return orjson.dumps(event, default=_json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(event, default=_json_default).encode("utf-8") + b"\n"
+
+
+# Handler setup of the "codenames" logger, shared by all GameLogger instances:
+# the (log file, console) it was configured for, and the listener thread that
+# writes queued records to the actual handlers
+_handler_config = None
+_queue_listener = None
+
+
+def _stop_queue_listener() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
+# GameLoggers with an open events file, closed at exit so buffered events aren't lost
+_open_loggers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_loggers() -> None:
+    """Flush and close the events files of all GameLoggers"""
+    for open_logger in list(_open_loggers):
+        open_logger.close()
+
 
 class GameLogger:
     """Logger for game sessions and AI decisions"""
     
-    def __init__(self, log_dir: str = "logs", log_level: int = logging.INFO):
+    def __init__(self, log_dir: str = "logs", log_level: int = logging.INFO, console: Optional[bool] = None):
         """
         Initialize the logger.
         
         Args:
             log_dir: Directory to store log files
             log_level: Logging level (from the logging module)
+            console: Also log to stderr. Defaults to the CODENAMES_LOG_CONSOLE
+                     environment variable ("1" to enable), otherwise off
         """
         self.log_dir = log_dir
         
@@ -30,30 +90,53 @@ class GameLogger:
         self.logger = logging.getLogger("codenames")
         self.logger.setLevel(log_level)
         
-        # Clear any existing handlers to avoid duplicates
-        if self.logger.hasHandlers():
-            self.logger.handlers.clear()
+        if console is None:
+            console = os.environ.get("CODENAMES_LOG_CONSOLE") == "1"
         
-        # Create a file handler for the log
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = os.path.join(log_dir, f"game_{timestamp}.log")
-        file_handler = logging.FileHandler(log_file)
+        # The handlers are process-wide: only (re)install them when the logger
+        # isn't already set up for this log file, so creating more GameLoggers is cheap
+        log_file = os.path.abspath(os.path.join(log_dir, "codenames.log"))
+        if _handler_config != (log_file, console):
+            self._setup_handlers(log_file, console)
         
-        # Create a console handler
-        console_handler = logging.StreamHandler()
+        # Game events are appended to an NDJSON file (one JSON object per line)
+        # as they happen; the file is opened on the first event. There is one
+        # file per game and process (see _events_path), so concurrent games
+        # never write to the same file. Event times are stored as integer
+        # nanoseconds since the epoch (time.time_ns())
+        self.game_id = None
+        self.events_file = None
+        self._events_fp = None
+    
+    def _setup_handlers(self, log_file: str, console: bool) -> None:
+        """Replace the logger's handlers with a size-rotated log file and, optionally, the console"""
+        global _handler_config, _queue_listener
         
-        # Create a formatter and add it to the handlers
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
+        # Clear any existing handlers to avoid duplicates
+        _stop_queue_listener()
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
         
-        # Add the handlers to the logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # Create a file handler for the log, rotated at 64 MiB
+        handlers = [RotatingFileHandler(log_file, maxBytes=64 << 20, backupCount=8)]
         
-        # Store game events for later saving
-        self.game_id = None
-        self.game_events = []
+        # Create a console handler if requested
+        if console:
+            handlers.append(logging.StreamHandler())
+        
+        # Create a formatter and add it to the handlers. Times are epoch seconds,
+        # which avoids a strftime call per record
+        formatter = logging.Formatter('%(created).3f - %(name)s - %(levelname)s - %(message)s')
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        # Log calls only enqueue the record; a background thread does the I/O
+        log_queue = queue.SimpleQueue()
+        _queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+        self.logger.addHandler(QueueHandler(log_queue))
+        _handler_config = (log_file, console)
     
     def start_game(self, game_id: str, config: Dict[str, Any]) -> None:
         """
@@ -63,18 +146,20 @@ class GameLogger:
             game_id: Unique identifier for the game
             config: Game configuration
         """
+        # Finish the previous game's file; this game's events go to a new one
+        self.close()
         self.game_id = game_id
-        self.game_events = []
         
         event = {
             "type": "game_start",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "game_id": game_id,
             "config": config
         }
         
-        self.game_events.append(event)
-        self.logger.info(f"Game {game_id} started with config: {json.dumps(config)}")
+        self._write_event(event)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Game %s started with config: %s", game_id, json.dumps(config))
     
     def log_clue(self, team: str, clue: str, number: int, targets: list = None) -> None:
         """
@@ -88,7 +173,7 @@ class GameLogger:
         """
         event = {
             "type": "clue",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "game_id": self.game_id,
             "team": team,
             "clue": clue,
@@ -96,9 +181,10 @@ class GameLogger:
             "targets": targets
         }
         
-        self.game_events.append(event)
-        target_str = f", targets: {targets}" if targets else ""
-        self.logger.info(f"Clue from {team}: '{clue}' {number}{target_str}")
+        self._write_event(event)
+        if self.logger.isEnabledFor(logging.INFO):
+            target_str = f", targets: {targets}" if targets else ""
+            self.logger.info("Clue from %s: '%s' %s%s", team, clue, number, target_str)
     
     def log_guess(self, team: str, word: str, result: Dict[str, Any]) -> None:
         """
@@ -111,15 +197,16 @@ class GameLogger:
         """
         event = {
             "type": "guess",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "game_id": self.game_id,
             "team": team,
             "word": word,
             "result": result
         }
         
-        self.game_events.append(event)
-        self.logger.info(f"Guess from {team}: '{word}', result: {json.dumps(result)}")
+        self._write_event(event)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Guess from %s: '%s', result: %s", team, word, json.dumps(result))
     
     def log_turn_end(self, team: str, reason: str) -> None:
         """
@@ -131,14 +218,14 @@ class GameLogger:
         """
         event = {
             "type": "turn_end",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "game_id": self.game_id,
             "team": team,
             "reason": reason
         }
         
-        self.game_events.append(event)
-        self.logger.info(f"Turn ended for {team}: {reason}")
+        self._write_event(event)
+        self.logger.info("Turn ended for %s: %s", team, reason)
     
     def log_game_end(self, winner: str, game_state: Dict[str, Any]) -> None:
         """
@@ -150,18 +237,18 @@ class GameLogger:
         """
         event = {
             "type": "game_end",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "game_id": self.game_id,
             "winner": winner,
             "turns": game_state.get("turn_count", 0),
             "final_state": game_state
         }
         
-        self.game_events.append(event)
-        self.logger.info(f"Game {self.game_id} ended. Winner: {winner}")
+        self._write_event(event)
+        self.logger.info("Game %s ended. Winner: %s", self.game_id, winner)
         
-        # Save the complete game log to a JSON file
-        self._save_game_log()
+        # Make sure the complete game is on disk
+        self.close()
     
     def log_ai_decision(self, agent_name: str, decision_type: str, data: Dict[str, Any]) -> None:
         """
@@ -174,36 +261,44 @@ class GameLogger:
         """
         event = {
             "type": "ai_decision",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "game_id": self.game_id,
             "agent": agent_name,
             "decision_type": decision_type,
             "data": data
         }
         
-        self.game_events.append(event)
+        self._write_event(event)
         
         # Log a condensed version to the standard log
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if "reasoning" in data:
             shortened = data["reasoning"][:100] + "..." if len(data["reasoning"]) > 100 else data["reasoning"]
-            self.logger.info(f"AI {agent_name} {decision_type}: {shortened}")
+            self.logger.info("AI %s %s: %s", agent_name, decision_type, shortened)
         else:
-            self.logger.info(f"AI {agent_name} made a {decision_type} decision")
+            self.logger.info("AI %s made a %s decision", agent_name, decision_type)
     
-    def _save_game_log(self) -> None:
-        """Save the full game log to a JSON file"""
-        if not self.game_id:
-            return
-            
-        game_log_dir = os.path.join(self.log_dir, "game_logs")
-        os.makedirs(game_log_dir, exist_ok=True)
-        
-        log_file = os.path.join(game_log_dir, f"game_{self.game_id}.json")
-        
-        with open(log_file, 'w') as f:
-            json.dump(self.game_events, f, indent=2)
-        
-        self.logger.info(f"Complete game log saved to {log_file}")
+    def close(self) -> None:
+        """Flush and close the events file; the next event opens it again"""
+        if self._events_fp is not None:
+            self._events_fp.close()
+            self._events_fp = None
+            _open_loggers.discard(self)
+    
+    def _events_path(self) -> str:
+        """Events file of the current game in this process (game_logs/<game_id>_<pid>.ndjson)"""
+        name = self.game_id if self.game_id is not None else "events"
+        return os.path.join(self.log_dir, "game_logs", f"{name}_{os.getpid()}.ndjson")
+    
+    def _write_event(self, event: Dict[str, Any]) -> None:
+        """Append an event to the NDJSON events file"""
+        if self._events_fp is None:
+            self.events_file = self._events_path()
+            os.makedirs(os.path.dirname(self.events_file), exist_ok=True)
+            self._events_fp = open(self.events_file, "ab", buffering=1 << 16)
+            _open_loggers.add(self)
+        self._events_fp.write(_dumps_line(event))
 
 
 # Global logger instance
@@ -1,12 +1,113 @@
 #!/usr/bin/env python
 # compare_experiment_strategies.py
+import argparse
+import math
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
 import os
 
-def compare_experiment_strategies(team_size_file, model_strength_file):
+# Rows read per chunk when summarizing an experiment CSV
+CHUNK_SIZE = 100_000
+
+
+# Win reason flags; a reason gets the sum of the flags whose text it contains
+ALL_CARDS_WIN = 1
+ASSASSIN_WIN = 2
+
+
+def classify_win_reason(reason):
+    """Return the win reason flags (ALL_CARDS_WIN / ASSASSIN_WIN) for a win_reason string"""
+    if not isinstance(reason, str):
+        return 0
+    flags = 0
+    if 'uncovering all their cards' in reason:
+        flags |= ALL_CARDS_WIN
+    if 'ASSASSIN' in reason:
+        flags |= ASSASSIN_WIN
+    return flags
+
+
+def count_win_reasons(win_reason):
+    """
+    Count games per win reason flags combination.
+    
+    Each distinct category is classified once; rows are then counted through
+    their integer category codes with np.bincount instead of a string scan per row.
+    
+    Args:
+        win_reason: Categorical Series of win reasons
+        
+    Returns:
+        Array of 4 counts, indexed by the flags value
+    """
+    categories = win_reason.cat.categories
+    # One extra entry at the end for missing values (category code -1)
+    flags_of = np.array([classify_win_reason(c) for c in categories] + [0], dtype=np.int8)
+    return np.bincount(flags_of[win_reason.cat.codes.to_numpy()], minlength=4)
+
+
+def summarize_results(path, chunksize=CHUNK_SIZE):
+    """
+    Stream an experiment results CSV and accumulate the statistics we compare.
+    
+    Only the turns_played and win_reason columns are read, chunk by chunk, so
+    large result files are never loaded into memory at once.
+    
+    Args:
+        path: Path to the experiment results CSV
+        chunksize: Number of rows to read per chunk
+        
+    Returns:
+        Dict with the number of games, the mean of turns_played and its sum of
+        squared deviations (m2), and the number of all-cards and ASSASSIN wins
+    """
+    stats = {'n': 0, 'mean': 0.0, 'm2': 0.0, 'all_cards': 0, 'assassin': 0}
+    reader = pd.read_csv(path, usecols=['turns_played', 'win_reason'],
+                         dtype={'turns_played': 'int32', 'win_reason': 'category'},
+                         engine='c', memory_map=True, chunksize=chunksize)
+    for chunk in reader:
+        update_moments(stats, chunk['turns_played'].to_numpy(dtype=np.float64))
+        
+        counts = count_win_reasons(chunk['win_reason'])
+        stats['all_cards'] += int(counts[ALL_CARDS_WIN] + counts[ALL_CARDS_WIN | ASSASSIN_WIN])
+        stats['assassin'] += int(counts[ASSASSIN_WIN] + counts[ALL_CARDS_WIN | ASSASSIN_WIN])
+    return stats
+
+
+def update_moments(stats, values):
+    """
+    Merge a chunk of values into running n / mean / m2 statistics, in place.
+    
+    Uses the pairwise form of Welford's algorithm (Chan et al.): the chunk's
+    own mean and m2 are computed with NumPy and combined with the running
+    ones, which stays numerically stable where sum-of-squares does not.
+    """
+    n_chunk = len(values)
+    if n_chunk == 0:
+        return
+    # Python floats from here on: the merge below is scalar arithmetic
+    mean_chunk = float(values.mean())
+    m2_chunk = float(np.square(values - mean_chunk).sum())
+    
+    n = stats['n'] + n_chunk
+    delta = mean_chunk - stats['mean']
+    stats['mean'] += delta * n_chunk / n
+    stats['m2'] += m2_chunk + delta ** 2 * stats['n'] * n_chunk / n
+    stats['n'] = n
+
+
+def calc_stats(stats):
+    """Mean of turns_played and its 95% confidence interval from accumulated stats"""
+    n = stats['n']
+    # Population standard deviation, as np.std computes it; plain float math on scalars
+    std = math.sqrt(stats['m2'] / n)
+    ci = 1.96 * std / math.sqrt(n)
+    return stats['mean'], ci
+
+
+def compare_experiment_strategies(team_size_file, model_strength_file, show=False):
     """
     Compare the two different experiment strategies:
     - Team Size Experiment (using weak agent for turns resolution)
@@ -15,31 +116,26 @@ def compare_experiment_strategies(team_size_file, model_strength_file):
     Args:
         team_size_file: Path to the team size experiment results CSV
         model_strength_file: Path to the model strength experiment results CSV
+        show: Also display the plots interactively (they are always saved)
     """
     # Read both CSV files
     print(f"Reading data from {team_size_file}...")
-    team_df = pd.read_csv(team_size_file)
+    team_stats = summarize_results(team_size_file)
     
     print(f"Reading data from {model_strength_file}...")
-    model_df = pd.read_csv(model_strength_file)
+    model_stats = summarize_results(model_strength_file)
     
     # Print basic information about the datasets
-    print(f"\nTeam size dataset contains {len(team_df)} games")
-    print(f"Model strength dataset contains {len(model_df)} games")
+    print(f"\nTeam size dataset contains {team_stats['n']} games")
+    print(f"Model strength dataset contains {model_stats['n']} games")
     
     # Calculate key statistics with confidence intervals
     
-    # Function to calculate mean and 95% CI
-    def calc_stats(data):
-        mean = np.mean(data)
-        ci = 1.96 * np.std(data) / np.sqrt(len(data))
-        return mean, ci
-    
     # Team Size Experiment (weak agent for turns resolution)
-    team_turns_mean, team_turns_ci = calc_stats(team_df['turns_played'])
+    team_turns_mean, team_turns_ci = calc_stats(team_stats)
     
     # Model Strength Experiment (strong agent for turns resolution)
-    model_turns_mean, model_turns_ci = calc_stats(model_df['turns_played'])
+    model_turns_mean, model_turns_ci = calc_stats(model_stats)
     
     # Prepare data for plotting
     categories = ['Weak Resolution Agent', 'Strong Resolution Agent']
@@ -51,107 +147,107 @@ def compare_experiment_strategies(team_size_file, model_strength_file):
     print(f"Weak Agent (Team Size Experiment): {team_turns_mean:.2f} ± {team_turns_ci:.2f} turns")
     print(f"Strong Agent (Model Strength Experiment): {model_turns_mean:.2f} ± {model_turns_ci:.2f} turns")
     
-    # Create the bar plot
-    plt.figure(figsize=(10, 6))
+    # Additional analysis - create a detailed comparison
+    print("\n--- Detailed Comparison ---")
     
-    # Plot bars with error bars
-    bars = plt.bar(categories, means, width=0.6, alpha=0.8, 
-             color=['#3498db', '#e74c3c'])
+    # Win reasons
+    team_all_cards = team_stats['all_cards']
+    team_assassin_fails = team_stats['assassin']
     
-    # Add error bars
-    plt.errorbar(categories, means, yerr=errors, fmt='none', ecolor='black', 
-                capsize=10, capthick=2, elinewidth=2)
+    model_all_cards = model_stats['all_cards']
+    model_assassin_fails = model_stats['assassin']
     
-    # Customize plot
-    plt.title('Having Strong Agent for Disagreement Resolution Helps to Finish Game', fontsize=16)
-    plt.ylabel('Average Number of Turns per Game', fontsize=12)
-    plt.ylim(0, max(means) + max(errors) + 2)  # Add some headroom
+    print("Win Reasons:")
+    print(f"  Weak Resolution Agent: {team_all_cards/team_stats['n']*100:.1f}% all cards open, {team_assassin_fails/team_stats['n']*100:.1f}% ASSASSIN reveals (communication failures)")
+    print(f"  Strong Resolution Agent: {model_all_cards/model_stats['n']*100:.1f}% all cards open, {model_assassin_fails/model_stats['n']*100:.1f}% ASSASSIN reveals (communication failures)")
     
-    # Add value labels on top of bars
-    for bar, mean, error in zip(bars, means, errors):
-        plt.text(bar.get_x() + bar.get_width()/2, mean + error + 0.3,
-                f'{mean:.2f} ± {error:.2f}', 
-                ha='center', va='bottom', fontsize=12)
+    # Data for stacked bar chart
+    all_cards_percentages = [team_all_cards/team_stats['n']*100, model_all_cards/model_stats['n']*100]
+    assassin_percentages = [team_assassin_fails/team_stats['n']*100, model_assassin_fails/model_stats['n']*100]
     
-    # Add explanatory notes
-    plt.figtext(0.5, 0.01, 
-                "Strong resolution mechanics are important for resolving conflicts within teams\nWeak Agent = Team Size Experiment, Strong Agent = Model Strength Experiment", 
-                ha="center", fontsize=10, style='italic')
+    # Draw both plots in a single figure; they share the same two categories on the x axis
+    fig, (turns_ax, reasons_ax) = plt.subplots(2, 1, figsize=(12, 10), sharex=True)
+    _plot_means(turns_ax, categories, means, errors)
+    _plot_reasons(reasons_ax, categories, all_cards_percentages, assassin_percentages)
     
-    # Add grid lines for better readability
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    # Add explanatory notes
+    fig.text(0.5, 0.01, 
+             "Strong resolution mechanics are important for resolving conflicts within teams\nWeak Agent = Team Size Experiment, Strong Agent = Model Strength Experiment", 
+             ha="center", fontsize=10, style='italic')
     
     # Adjust layout
-    plt.tight_layout(rect=[0, 0.05, 1, 0.95])
+    fig.tight_layout(rect=[0, 0.05, 1, 0.95])
     
     # Generate timestamp for the output file
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     plot_filename = f"strategy_comparison_{timestamp}.png"
     
     # Save the plot
-    plt.savefig(plot_filename)
+    fig.savefig(plot_filename, dpi=100)
     print(f"Plot saved to {plot_filename}")
     
     # Show the plot
-    plt.show()
-    
-    # Additional analysis - create a detailed comparison
-    print("\n--- Detailed Comparison ---")
-    
-    # Win reasons
-    team_all_cards = team_df[team_df['win_reason'].str.contains('uncovering all their cards')].shape[0]
-    team_assassin_fails = team_df[team_df['win_reason'].str.contains('ASSASSIN')].shape[0]
-    
-    model_all_cards = model_df[model_df['win_reason'].str.contains('uncovering all their cards')].shape[0]
-    model_assassin_fails = model_df[model_df['win_reason'].str.contains('ASSASSIN')].shape[0]
+    if show:
+        plt.show()
+    plt.close(fig)
+
+
+def _plot_means(ax, categories, means, errors):
+    """Bar plot of the average number of turns with 95% CI error bars"""
+    # Plot bars with error bars
+    bars = ax.bar(categories, means, width=0.6, alpha=0.8, 
+                  color=['#3498db', '#e74c3c'])
     
-    print("Win Reasons:")
-    print(f"  Weak Resolution Agent: {team_all_cards/len(team_df)*100:.1f}% all cards open, {team_assassin_fails/len(team_df)*100:.1f}% ASSASSIN reveals (communication failures)")
-    print(f"  Strong Resolution Agent: {model_all_cards/len(model_df)*100:.1f}% all cards open, {model_assassin_fails/len(model_df)*100:.1f}% ASSASSIN reveals (communication failures)")
+    # Add error bars
+    ax.errorbar(categories, means, yerr=errors, fmt='none', ecolor='black', 
+                capsize=10, capthick=2, elinewidth=2)
     
-    # Create a second plot comparing win reasons
-    plt.figure(figsize=(12, 7))
+    # Customize plot
+    ax.set_title('Having Strong Agent for Disagreement Resolution Helps to Finish Game', fontsize=16)
+    ax.set_ylabel('Average Number of Turns per Game', fontsize=12)
+    ax.set_ylim(0, max(means) + max(errors) + 2)  # Add some headroom
     
-    # Data for stacked bar chart
-    all_cards_percentages = [team_all_cards/len(team_df)*100, model_all_cards/len(model_df)*100]
-    assassin_percentages = [team_assassin_fails/len(team_df)*100, model_assassin_fails/len(model_df)*100]
+    # Add value labels on top of bars
+    for bar, mean, error in zip(bars, means, errors):
+        ax.text(bar.get_x() + bar.get_width()/2, mean + error + 0.3,
+                f'{mean:.2f} ± {error:.2f}', 
+                ha='center', va='bottom', fontsize=12)
     
+    # Add grid lines for better readability
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+
+def _plot_reasons(ax, categories, all_cards_percentages, assassin_percentages):
+    """Stacked bar plot of how games were won"""
     # Create stacked bars
-    plt.bar(categories, all_cards_percentages, label='All Cards Open', color='#2ecc71')
-    plt.bar(categories, assassin_percentages, bottom=all_cards_percentages, 
-            label='ASSASSIN Reveals (Communication Failure)', color='#e74c3c')
-    
-    # Add value labels on bars
-    for i, (all_cards, assassin) in enumerate(zip(all_cards_percentages, assassin_percentages)):
-        # Label for all cards open
-        plt.text(i, all_cards/2, f'{all_cards:.1f}%', ha='center', va='center', 
-                color='white', fontweight='bold', fontsize=12)
-        
-        # Label for assassin reveals
-        plt.text(i, all_cards + assassin/2, f'{assassin:.1f}%', ha='center', va='center', 
-                color='white', fontweight='bold', fontsize=12)
+    all_cards_bars = ax.bar(categories, all_cards_percentages, label='All Cards Open', color='#2ecc71')
+    assassin_bars = ax.bar(categories, assassin_percentages, bottom=all_cards_percentages, 
+                           label='ASSASSIN Reveals (Communication Failure)', color='#e74c3c')
+    
+    # Add value labels in the middle of each bar segment
+    for bars in (all_cards_bars, assassin_bars):
+        ax.bar_label(bars, fmt='%.1f%%', label_type='center',
+                     color='white', fontweight='bold', fontsize=12)
     
     # Customize plot
-    plt.title('Strong Resolution Agents Help Teams Communicate Effectively', fontsize=16)
-    plt.ylabel('Percentage of Games (%)', fontsize=12)
-    plt.ylim(0, 105)  # Leave room for labels
-    plt.legend(loc='upper right')
+    ax.set_title('Strong Resolution Agents Help Teams Communicate Effectively', fontsize=16)
+    ax.set_ylabel('Percentage of Games (%)', fontsize=12)
+    ax.set_ylim(0, 105)  # Leave room for labels
+    ax.legend(loc='upper right')
     
     # Add grid lines
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    
-    # Adjust layout
-    plt.tight_layout()
-    
-    # Save the win reasons plot
-    win_reasons_filename = f"win_reasons_comparison_{timestamp}.png"
-    plt.savefig(win_reasons_filename)
-    print(f"Win reasons plot saved to {win_reasons_filename}")
-    
-    # Show the plot
-    plt.show()
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the team size and model strength experiments")
+    parser.add_argument("--show", action="store_true", help="Display the plots interactively")
+    args = parser.parse_args()
+    
+    # Render with the non-interactive Agg backend unless the plots are shown
+    if not args.show:
+        plt.switch_backend("Agg")
+    
     # Default CSV files to read
     team_size_file = "team_size_results.csv"
     model_strength_file = "model_strength_results.csv"
@@ -166,4 +262,4 @@ if __name__ == "__main__":
         exit(1)
     
     # Run the comparison
-    compare_experiment_strategies(team_size_file, model_strength_file)
+    compare_experiment_strategies(team_size_file, model_strength_file, show=args.show)
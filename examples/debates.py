@@ -13,99 +13,139 @@ It shows:
 This example requires an OpenAI API key to work properly.
 """
 
+import logging
 import os
 import sys
+import threading
 import time
 import random
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 
-# Add the parent directory to sys.path so Python can find the codenames module
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 # Import core game components
 from codenames.game import CardType, GameEngine, GameState
 from codenames.words import WORD_LIST
 
 # Import AI agents
-from codenames.agents.spymaster import SpymasterAgent 
+from codenames.agents.spymaster import ClueCache, SpymasterAgent
 from codenames.agents.operative import OperativeAgent
 
 # Import debate manager
 from codenames.agents.debates import DebateManager
 
-# Fix for the 'correct' key bug in generate_guess
-def fix_previous_guesses_format(previous_guesses: List[Dict]) -> List[Dict]:
-    """Add 'correct' key to guess dictionaries if missing"""
-    fixed_guesses = []
-    for guess in previous_guesses:
-        fixed_guess = guess.copy()
-        # If 'correct' key doesn't exist, derive it from card_type
-        if 'correct' not in fixed_guess and 'result' in fixed_guess:
-            # In the original bug, we need to determine correctness based on the card type
-            # If the card type matches the current team, it's correct
-            current_team = guess.get('team', 'unknown')
-            fixed_guess['correct'] = (fixed_guess['result'] == current_team)
-            # Also map result to revealed_type for compatibility
-            fixed_guess['revealed_type'] = fixed_guess['result']
-        fixed_guesses.append(fixed_guess)
-    return fixed_guesses
+# Seconds to pause before each team decision so the output can be followed;
+# no pause when the output is piped or redirected
+DISPLAY_DELAY = float(os.getenv("CODENAMES_DISPLAY_DELAY", "1" if sys.stdout.isatty() else "0"))
 
+# Display strings per card type, so rendering does no per-card enum work
+_TYPE_UPPER = {t: t.value.upper() for t in CardType}
+_TEAM_LABEL = {t: f"{upper} Team" for t, upper in _TYPE_UPPER.items()}
 
-def display_board(game_state: GameState, show_all: bool = False):
-    """Display the game board in a formatted grid
+# Output of the example; CODENAMES_QUIET=1 keeps only warnings
+logger = logging.getLogger("codenames.example")
+
+# Spymaster clues are cached here by board state, so replaying a game (see
+# CODENAMES_SEED) skips the clue requests made by earlier runs
+CLUE_CACHE_PATH = os.getenv("CODENAMES_CLUE_CACHE", "~/.cache/codenames/clues.json")
+
+# Seed for the board layout; unset for a new random board on every run
+SEED = os.getenv("CODENAMES_SEED")
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that leaves flushing to explicit flush() calls
+    instead of flushing the stream after every record"""
     
-    Args:
-        game_state: The current game state
-        show_all: If True, show all card types (spymaster view),
-                 otherwise show only revealed cards (operative view)
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+def setup_logging() -> logging.Handler:
+    """Send the example's output to stdout without a flush per message
+    
+    Records share sys.stdout's buffer, so they stay in order with output
+    printed by the agents. The caller flushes the returned handler at turn
+    boundaries and before waiting on the user.
     """
-    print("\n" + "=" * 50)
-    print(f"GAME: {game_state.game_id}")
-    print(f"Turn: {game_state.turn}, Current Team: {game_state.current_team.value.upper()}")
-    print(f"RED remaining: {game_state.red_remaining}, BLUE remaining: {game_state.blue_remaining}")
-    print("=" * 50)
+    logger.setLevel(logging.WARNING if os.getenv("CODENAMES_QUIET") == "1" else logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        handler = BufferedStreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    return logger.handlers[0]
+
+
+@lru_cache(maxsize=256)
+def _render_grid(board: Tuple[Tuple[str, str, bool], ...], show_all: bool) -> str:
+    """Render the board grid for display_board
     
-    # Calculate the grid dimensions
+    Args:
+        board: (word, upper-case card type, revealed) for each card, in board order
+        show_all: If True, show all card types, otherwise only revealed ones
+    """
+    # Calculate the grid dimensions; columns fit the longest word
     size = 5
+    width = max(12, max(len(word) for word, _, _ in board) + 2)
     
     # Display the board as a grid
+    lines = []
     for i in range(size):
-        row = game_state.board[i*size:(i+1)*size]
+        row = board[i*size:(i+1)*size]
         
-        # Display word row
-        for card in row:
-            print(f"{card.word:<12}", end="")
-        print()
+        # Word row
+        lines.append("".join(word.ljust(width) for word, _, _ in row))
         
-        # Display card type or index row
-        for j, card in enumerate(row):
-            idx = i*size + j + 1
-            if show_all or card.revealed:
-                print(f"[{card.type.value.upper():<10}]", end="")
-            else:
-                print(f"[{idx:<10}]", end="")
-        print("\n")
+        # Card type or index row
+        lines.append("".join(
+            f"[{card_type if show_all or revealed else i*size + j + 1:<{width - 2}}]"
+            for j, (_, card_type, revealed) in enumerate(row)
+        ))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def display_board(game_state: GameState, show_all: bool = False):
+    """Display the game board in a formatted grid
+    
+    Args:
+        game_state: The current game state
+        show_all: If True, show all card types (spymaster view),
+                 otherwise show only revealed cards (operative view)
+    """
+    # Collect the whole display and write it at once
+    lines = [
+        "",
+        "=" * 50,
+        f"GAME: {game_state.game_id}",
+        f"Turn: {game_state.turn_count}, Current Team: {_TYPE_UPPER[game_state.current_team]}",
+        f"RED remaining: {game_state.red_remaining}, BLUE remaining: {game_state.blue_remaining}",
+        "=" * 50,
+    ]
+    
+    # The grid only changes when a card is revealed, so it is rendered once per board state
+    board = tuple((card.word, _TYPE_UPPER[card.type], card.revealed) for card in game_state.board)
+    lines.append(_render_grid(board, show_all))
     
     # Display recent history
-    if game_state.clue_history:
-        last_clue = game_state.clue_history[-1]
+    clue_history = game_state.clue_history
+    if clue_history:
+        last_clue = clue_history[-1]
         # Make the team name more readable
-        team_name = last_clue[0]
-        if hasattr(team_name, 'value'):
-            team_name = f"{team_name.value.upper()} Team"
-        print(f"Last clue: '{last_clue[1]}' {last_clue[2]} (by {team_name})")
-    
-    if game_state.guess_history:
-        print("Recent guesses:")
-        for i in range(min(3, len(game_state.guess_history))):
-            guess = game_state.guess_history[-(i+1)]
+        team_name = _TEAM_LABEL.get(last_clue[0], str(last_clue[0]))
+        lines.append(f"Last clue: '{last_clue[1]}' {last_clue[2]} (by {team_name})")
+    
+    guess_history = game_state.guess_history
+    if guess_history:
+        lines.append("Recent guesses:")
+        for guess in reversed(guess_history[-3:]):
             
             # Make the team name more readable
-            team = guess[0]
-            if hasattr(team, 'value'):
-                team_name = f"{team.value.upper()} Team"
-            else:
-                team_name = str(team)
+            team_name = _TEAM_LABEL.get(guess[0], str(guess[0]))
             
             # Check the format of the card type entry
             if isinstance(guess[2], CardType):
@@ -114,236 +154,253 @@ def display_board(game_state: GameState, show_all: bool = False):
                 card_type = guess[2]
             elif isinstance(guess[2], bool):
                 # If it's a boolean, it's probably a result flag, so get the card_type
-                card = next((c for c in game_state.board if c.word == guess[1] and c.revealed), None)
-                card_type = card.type.value if card else "unknown"
+                card = game_state.card_for_word(guess[1])
+                card_type = card.type.value if card is not None and card.revealed else "unknown"
             else:
                 card_type = str(guess[2])
                 
-            print(f"  - {team_name} guessed '{guess[1]}' ({card_type})")
+            lines.append(f"  - {team_name} guessed '{guess[1]}' ({card_type})")
+    
+    lines.append("=" * 50 + "\n")
+    logger.info("\n".join(lines))
+
+
+def give_clue(spymaster: SpymasterAgent, operatives: List[OperativeAgent],
+              debate_manager: DebateManager, game_state: GameState,
+              previous_guesses: List[Dict], executor: ThreadPoolExecutor,
+              cancel_debate: threading.Event) -> Tuple[str, int, List[str], Future]:
+    """Get a clue from the spymaster, starting the team's first debate as soon as the
+    clue word and number are streamed, while the spymaster is still writing its targets
+    
+    The debate stops at its next step once cancel_debate is set, which happens here
+    if the final clue differs from the streamed one.
+    
+    Returns:
+        The clue word, number and targets, and a future for the first debate result
+        (None if the final clue differs from the streamed one)
+    """
+    streamed = []
+    
+    def on_clue(clue_word, clue_number):
+        streamed.append((clue_word, clue_number, executor.submit(
+            debate_manager.run_debate, operatives, game_state, clue_word, clue_number, 0, previous_guesses,
+            cancel_event=cancel_debate
+        )))
+    
+    clue_word, clue_number, target_words = spymaster.generate_clue(game_state, on_clue=on_clue)
+    
+    # The number is corrected to the count of targets after streaming; a debate
+    # about a different clue can't be used
+    streamed_word, streamed_number, first_debate = streamed[0]
+    if (streamed_word, streamed_number) != (clue_word, clue_number):
+        logger.debug(f"Clue changed from '{streamed_word}' {streamed_number} after streaming, "
+                     f"restarting the debate")
+        cancel_debate.set()
+        first_debate = None
+    return clue_word, clue_number, target_words, first_debate
+
+
+def run_team_turn(engine: GameEngine, game_id: str, team: CardType,
+                  spymaster: SpymasterAgent, operatives: List[OperativeAgent],
+                  debate_manager: DebateManager, previous_guesses: List[Dict],
+                  executor: ThreadPoolExecutor, log_handler: logging.Handler):
+    """Play one team's turn: the spymaster's clue, then debated guesses until the turn ends
+    
+    Args:
+        engine: Game engine running the game
+        game_id: ID of the game
+        team: The team whose turn it is
+        spymaster: The team's spymaster
+        operatives: The team's operatives
+        debate_manager: Debate manager for the operatives' guesses
+        previous_guesses: The team's previous guesses; the turn's guesses are appended
+        executor: Executor for the debate started with the clue
+        log_handler: Output handler, flushed before pauses and at the end of the turn
+    """
+    game_state = engine.get_game(game_id)
+    team_name = team.value.capitalize()
+    opposite_team = "BLUE" if team == CardType.RED else "RED"
+    
+    logger.info("\n" + "=" * 20 + f" {team.value.upper()} TEAM'S TURN " + "=" * 20)
+    
+    # Generate a clue from the spymaster
+    logger.info(f"\n{team_name} Spymaster is thinking...")
+    cancel_debate = threading.Event()
+    clue_word, clue_number, target_words, first_debate = give_clue(
+        spymaster, operatives, debate_manager, game_state, previous_guesses, executor, cancel_debate
+    )
+    
+    # Process the clue; a rejected clue ends the turn without guesses
+    error = None
+    try:
+        engine.process_clue(game_id, clue_word, target_words, team)
+    except ValueError as e:
+        error = str(e)
+    if error is not None:
+        logger.info(f"\n{team_name} Spymaster's clue '{clue_word}' was rejected ({error}). Turn ends.")
+        cancel_debate.set()
+        engine.end_turn(game_id, team)
+        log_handler.flush()
+        return
+    logger.info(f"\n{team_name} Spymaster gives the clue: '{clue_word}' {clue_number}")
+    logger.info(f"Target words: {', '.join(target_words)}")
+    
+    # Team debate for guesses
+    correct_guesses = 0
+    turn_ongoing = True
+    guesses_made = 0
+    
+    while turn_ongoing and guesses_made < clue_number + 1:
+        # Add a short delay for readability
+        if DISPLAY_DELAY:
+            log_handler.flush()
+            time.sleep(DISPLAY_DELAY)
+        
+        # Team debate to make a decision; the first one may have started with the clue
+        if guesses_made == 0 and first_debate is not None:
+            debate_result = first_debate.result()
+        else:
+            debate_result = debate_manager.run_debate(
+                operatives, game_state, clue_word, clue_number, 
+                correct_guesses, previous_guesses
+            )
+        
+        guess = debate_result["final_decision"]
+        
+        if guess.lower() == "end":
+            logger.info(f"\n{team_name} team decided to end their turn.")
+            engine.end_turn(game_id, team)
+            break
+        
+        logger.info(f"\n{team_name} team guesses: '{guess}'")
+        
+        # Process the guess
+        guess_result = engine.process_guess(game_id, guess, team)
+        guesses_made += 1
+        
+        # Record the guess for future reference, in the format generate_guess reads
+        previous_guesses.append({
+            "word": guess,
+            "result": guess_result["card_type"],
+            "revealed_type": guess_result["card_type"],
+            "team": team.value,
+            "correct": guess_result["card_type"] == team.value
+        })
+        
+        # Display the result
+        if guess_result["card_type"] == team.value:
+            logger.info(f"Correct! '{guess}' is a {team.value.upper()} card.")
+            correct_guesses += 1
+        elif guess_result["card_type"] == "assassin":
+            logger.info(f"Oh no! '{guess}' is the ASSASSIN card. Game over!")
+            turn_ongoing = False
+        else:
+            if guess_result["card_type"] == opposite_team.lower():
+                logger.info(f"Oops! '{guess}' is a {opposite_team} card. Turn ends.")
+            else:
+                logger.info(f"'{guess}' is a NEUTRAL card. Turn ends.")
+            turn_ongoing = False
+        
+        # Display the updated board
+        display_board(game_state, show_all=False)
+        
+        # Check if game is over
+        if game_state.is_game_over():
+            break
+        
+        # Check if turn should end
+        if guess_result["end_turn"]:
+            turn_ongoing = False
     
-    print("=" * 50 + "\n")
+    # End turn if still ongoing
+    if turn_ongoing:
+        logger.info(f"Maximum guesses reached. {team_name} team's turn ends.")
+        engine.end_turn(game_id, team)
+    log_handler.flush()
 
 
 def run_debate_example():
     """
     Run a sample debate between AI operatives
     """
-    print("\n\n=== CODENAMES DEBATE EXAMPLE ===\n")
+    log_handler = setup_logging()
+    logger.info("\n\n=== CODENAMES DEBATE EXAMPLE ===\n")
     
     # Check for API key
     if not os.environ.get("OPENAI_API_KEY"):
-        print("WARNING: No OpenAI API key found in environment variables.")
-        print("Please set the OPENAI_API_KEY environment variable.")
-        print("For example: export OPENAI_API_KEY='your-api-key-here'")
+        logger.warning("WARNING: No OpenAI API key found in environment variables.")
+        logger.warning("Please set the OPENAI_API_KEY environment variable.")
+        logger.warning("For example: export OPENAI_API_KEY='your-api-key-here'")
+        log_handler.flush()
         api_key = input("\nEnter your OpenAI API key to continue: ").strip()
         if api_key:
             os.environ["OPENAI_API_KEY"] = api_key
         else:
-            print("No API key provided. Exiting.")
+            logger.warning("No API key provided. Exiting.")
+            log_handler.flush()
             return
     
     # Initialize the game engine
     engine = GameEngine(WORD_LIST)
     
     # Create AI players
-    red_spymaster = SpymasterAgent(name="Red Spymaster", team=CardType.RED)
+    clue_cache = ClueCache(CLUE_CACHE_PATH)
+    red_spymaster = SpymasterAgent(name="Red Spymaster", team=CardType.RED, clue_cache=clue_cache)
     red_op1 = OperativeAgent(name="Red Op 1", team=CardType.RED)
     red_op2 = OperativeAgent(name="Red Op 2", team=CardType.RED)
     red_team = [red_op1, red_op2]
     
-    blue_spymaster = SpymasterAgent(name="Blue Spymaster", team=CardType.BLUE)
+    blue_spymaster = SpymasterAgent(name="Blue Spymaster", team=CardType.BLUE, clue_cache=clue_cache)
     blue_op1 = OperativeAgent(name="Blue Op 1", team=CardType.BLUE)
     blue_op2 = OperativeAgent(name="Blue Op 2", team=CardType.BLUE)
     blue_team = [blue_op1, blue_op2]
     
-    # Initialize the debate manager
-    debate_manager = DebateManager(max_rounds=2)
+    # Initialize the debate manager; OpenAI supports n > 1, so each team's proposals
+    # and final votes are requested in a single API call
+    debate_manager = DebateManager(max_rounds=2, batch_requests=True)
     
     # Create a new game
-    game_id = engine.create_game()
+    game_id = engine.create_game(seed=int(SEED) if SEED else None)
     game_state = engine.get_game(game_id)
-    print(f"Created new game with ID: {game_id}")
+    logger.info(f"Created new game with ID: {game_id}")
     
     # Display the initial board (spymaster view)
-    print("\nINITIAL BOARD (SPYMASTER VIEW):")
+    logger.info("\nINITIAL BOARD (SPYMASTER VIEW):")
     display_board(game_state, show_all=True)
     
     # Track both teams' previous guesses
     red_previous_guesses = []
     blue_previous_guesses = []
     
+    # Runs each team's first debate alongside the end of its spymaster's response
+    executor = ThreadPoolExecutor(max_workers=1)
+    
+    turns = [
+        (CardType.RED, red_spymaster, red_team, red_previous_guesses),
+        (CardType.BLUE, blue_spymaster, blue_team, blue_previous_guesses),
+    ]
+    
     # Run a single round for each team to demonstrate debate
-    for _ in range(1):  # Just one round for the example
-        # RED TEAM'S TURN
-        print("\n" + "=" * 20 + " RED TEAM'S TURN " + "=" * 20)
-        
-        # Generate a clue from the red spymaster
-        print("\nRed Spymaster is thinking...")
-        clue_word, clue_number, target_words = red_spymaster.generate_clue(game_state)
-        
-        # Process the clue
-        engine.process_clue(game_id, clue_word, clue_number, CardType.RED)
-        print(f"\nRed Spymaster gives the clue: '{clue_word}' {clue_number}")
-        print(f"Target words: {', '.join(target_words)}")
-        
-        # Team debate for guesses
-        correct_guesses = 0
-        turn_ongoing = True
-        guesses_made = 0
-        
-        while turn_ongoing and guesses_made < clue_number + 1:
-            # Add a short delay for readability
-            time.sleep(1)
-            
-            # Use fix_previous_guesses_format to ensure correct format
-            fixed_previous_guesses = fix_previous_guesses_format(red_previous_guesses)
-            
-            # Team debate to make a decision
-            debate_result = debate_manager.run_debate(
-                red_team, game_state, clue_word, clue_number, 
-                correct_guesses, fixed_previous_guesses
-            )
-            
-            guess = debate_result["final_decision"]
-            
-            if guess.lower() == "end":
-                print("\nRed team decided to end their turn.")
-                engine.end_turn(game_id, CardType.RED)
-                break
-            
-            print(f"\nRed team guesses: '{guess}'")
-            
-            # Process the guess
-            guess_result = engine.process_guess(game_id, guess, CardType.RED)
-            guesses_made += 1
-            
-            # Record the guess for future reference
-            red_previous_guesses.append({
-                "word": guess,
-                "result": guess_result["card_type"],
-                "team": "red",  # Add team so we can determine correctness later
-                "correct": guess_result["card_type"] == "red"  # Explicitly add correct key
-            })
-            
-            # Display the result
-            if guess_result["card_type"] == "red":
-                print(f"Correct! '{guess}' is a RED card.")
-                correct_guesses += 1
-            elif guess_result["card_type"] == "assassin":
-                print(f"Oh no! '{guess}' is the ASSASSIN card. Game over!")
-                turn_ongoing = False
-            else:
-                opposite_team = "BLUE"
-                if guess_result["card_type"] == opposite_team.lower():
-                    print(f"Oops! '{guess}' is a {opposite_team} card. Turn ends.")
-                else:
-                    print(f"'{guess}' is a NEUTRAL card. Turn ends.")
-                turn_ongoing = False
-            
-            # Display the updated board
-            display_board(game_state, show_all=False)
-            
-            # Check if game is over
-            if game_state.is_game_over():
-                break
-            
-            # Check if turn should end
-            if guess_result["end_turn"]:
-                turn_ongoing = False
-        
-        # End turn if still ongoing
-        if turn_ongoing:
-            print("Maximum guesses reached. Red team's turn ends.")
-            engine.end_turn(game_id, CardType.RED)
-        
-        # BLUE TEAM'S TURN
-        print("\n" + "=" * 20 + " BLUE TEAM'S TURN " + "=" * 20)
-        
-        # Generate a clue from the blue spymaster
-        print("\nBlue Spymaster is thinking...")
-        clue_word, clue_number, target_words = blue_spymaster.generate_clue(game_state)
-        
-        # Process the clue
-        engine.process_clue(game_id, clue_word, clue_number, CardType.BLUE)
-        print(f"\nBlue Spymaster gives the clue: '{clue_word}' {clue_number}")
-        print(f"Target words: {', '.join(target_words)}")
-        
-        # Team debate for guesses
-        correct_guesses = 0
-        turn_ongoing = True
-        guesses_made = 0
-        
-        while turn_ongoing and guesses_made < clue_number + 1:
-            # Add a short delay for readability
-            time.sleep(1)
-            
-            # Use fix_previous_guesses_format to ensure correct format
-            fixed_previous_guesses = fix_previous_guesses_format(blue_previous_guesses)
-            
-            # Team debate to make a decision
-            debate_result = debate_manager.run_debate(
-                blue_team, game_state, clue_word, clue_number, 
-                correct_guesses, fixed_previous_guesses
-            )
-            
-            guess = debate_result["final_decision"]
-            
-            if guess.lower() == "end":
-                print("\nBlue team decided to end their turn.")
-                engine.end_turn(game_id, CardType.BLUE)
-                break
-            
-            print(f"\nBlue team guesses: '{guess}'")
-            
-            # Process the guess
-            guess_result = engine.process_guess(game_id, guess, CardType.BLUE)
-            guesses_made += 1
-            
-            # Record the guess for future reference
-            blue_previous_guesses.append({
-                "word": guess,
-                "result": guess_result["card_type"],
-                "team": "blue",  # Add team so we can determine correctness later
-                "correct": guess_result["card_type"] == "blue"  # Explicitly add correct key
-            })
-            
-            # Display the result
-            if guess_result["card_type"] == "blue":
-                print(f"Correct! '{guess}' is a BLUE card.")
-                correct_guesses += 1
-            elif guess_result["card_type"] == "assassin":
-                print(f"Oh no! '{guess}' is the ASSASSIN card. Game over!")
-                turn_ongoing = False
-            else:
-                opposite_team = "RED"
-                if guess_result["card_type"] == opposite_team.lower():
-                    print(f"Oops! '{guess}' is a {opposite_team} card. Turn ends.")
-                else:
-                    print(f"'{guess}' is a NEUTRAL card. Turn ends.")
-                turn_ongoing = False
-            
-            # Display the updated board
-            display_board(game_state, show_all=False)
-            
-            # Check if game is over
-            if game_state.is_game_over():
-                break
-            
-            # Check if turn should end
-            if guess_result["end_turn"]:
-                turn_ongoing = False
-        
-        # End turn if still ongoing
-        if turn_ongoing:
-            print("Maximum guesses reached. Blue team's turn ends.")
-            engine.end_turn(game_id, CardType.BLUE)
+    try:
+        for _ in range(1):  # Just one round for the example
+            for team, spymaster, operatives, previous_guesses in turns:
+                # Once the game is over (e.g. the assassin was guessed), no further
+                # clue or debate is requested
+                if game_state.is_game_over():
+                    break
+                run_team_turn(engine, game_id, team, spymaster, operatives,
+                              debate_manager, previous_guesses, executor, log_handler)
+    finally:
+        # Drop a debate that has not started yet when the game is left early (error or Ctrl+C)
+        executor.shutdown(cancel_futures=True)
     
     # Display the final board state
-    print("\nFINAL BOARD STATE:")
+    logger.info("\nFINAL BOARD STATE:")
     display_board(game_state, show_all=True)
     
-    print("\nDebate example completed. This demonstrates how to use the DebateManager")
-    print("to facilitate multi-agent decision making in the Codenames game.")
+    logger.info("\nDebate example completed. This demonstrates how to use the DebateManager")
+    logger.info("to facilitate multi-agent decision making in the Codenames game.")
+    log_handler.flush()
 
 
 if __name__ == "__main__":
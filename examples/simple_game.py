@@ -13,15 +13,10 @@ without AI agents or debates. It shows how to:
 This serves as a simple introduction to the game's core functionality.
 """
 
-import os
-import sys
 import random
 from typing import List, Dict
 from pprint import pprint
 
-# Add the parent directory to sys.path so Python can find the codenames module
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 # Import core game components
 from codenames.game import CardType, GameEngine, GameState, print_board
 from codenames.words import WORD_LIST
@@ -42,11 +37,7 @@ def get_valid_cards_for_team(game_state, team):
     Returns:
         List of card words belonging to the team that haven't been revealed yet
     """
-    valid_cards = []
-    for card in game_state.board:
-        if not card.revealed and card.type == team:
-            valid_cards.append(card.word)
-    return valid_cards
+    return game_state.unrevealed_words(team)
 
 
 def main():
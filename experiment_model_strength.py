@@ -1,12 +1,49 @@
+import csv
+import logging
 import os
 import time
+import traceback
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Tuple
-import random
+from typing import List, Dict, Any, Optional
 
 # Import the game function
-from updated_play_codenames_game_standalone import play_codenames_game, CardType
+from updated_play_codenames_game_standalone import GameAPIError, play_codenames_game
+
+# Columns of the results CSV, in file order
+RESULT_COLUMNS = [
+    'weaker_team_color', 'weaker_team_size', 'weaker_model',
+    'stronger_team_color', 'stronger_team_size', 'stronger_model',
+    'judge_model', 'team_size_ratio', 'iteration', 'winner',
+    'weaker_team_won', 'stronger_team_won', 'turns_played',
+    'win_reason', 'game_duration', 'red_team_size', 'red_model',
+    'blue_team_size', 'blue_model'
+]
+
+# Minimum seconds between progress lines while games finish
+PROGRESS_INTERVAL = 10.0
+
+# Games played at once unless max_workers is given. Each game sends its API
+# requests one after another, so this keeps the run at a few requests in flight,
+# below the agents' default MAX_CONCURRENCY of 8
+DEFAULT_MAX_WORKERS = 4
+
+logger = logging.getLogger(__name__)
+
+# Rows read per chunk when summarizing the combined results file
+SUMMARY_CHUNK_SIZE = 50_000
+
+# Types of the columns the summary reads, so the parser does no type inference.
+# Nullable, since rows of interrupted or older runs can have empty cells
+SUMMARY_DTYPES = {
+    'weaker_team_size': 'Int16',
+    'stronger_team_size': 'Int16',
+    'weaker_team_won': 'Int8',
+    'stronger_team_won': 'Int8',
+    'turns_played': 'Int16',
+}
 
 class ModelStrengthExperiment:
     """Class to run Codenames experiments with varying model strengths and team sizes"""
@@ -20,7 +57,11 @@ class ModelStrengthExperiment:
                  iterations: int,
                  max_turns: int,
                  weaker_team_color: str = "RED",
-                 seed: int = None):
+                 seed: int = None,
+                 debate_rounds: int = 1,
+                 max_workers: Optional[int] = None,
+                 rate_limit_delay: float = 0.0,
+                 verbose_errors: bool = True):
         """
         Initialize the experiment runner
         
@@ -34,6 +75,13 @@ class ModelStrengthExperiment:
             max_turns: Maximum number of turns per game
             weaker_team_color: Which team color to assign to the weaker model ("RED" or "BLUE")
             seed: Random seed for reproducibility (None for random)
+            debate_rounds: Number of rounds of debate for each turn
+            max_workers: Number of games played at once, each in its own process
+                         (default: DEFAULT_MAX_WORKERS, at most one per game)
+            rate_limit_delay: Seconds between starting games, to spread out the
+                              first API requests
+            verbose_errors: Print the traceback of games that fail with an unexpected
+                            error; every failed game is reported by error type either way
         """
         self.weaker_team_sizes = weaker_team_sizes
         self.stronger_team_sizes = stronger_team_sizes
@@ -45,8 +93,26 @@ class ModelStrengthExperiment:
         self.weaker_team_color = weaker_team_color.upper()
         self.stronger_team_color = "BLUE" if self.weaker_team_color == "RED" else "RED"
         self.seed = seed
+        self.debate_rounds = debate_rounds
+        self.max_workers = max_workers
+        self.rate_limit_delay = rate_limit_delay
+        self.verbose_errors = verbose_errors
         self.results_df = None
         
+        # Team setup and the result fields it determines are the same for every game
+        self._is_red_weaker = self.weaker_team_color == "RED"
+        self._red_model = weaker_model if self._is_red_weaker else stronger_model
+        self._blue_model = stronger_model if self._is_red_weaker else weaker_model
+        self._static_result_fields = {
+            'weaker_team_color': self.weaker_team_color,
+            'weaker_model': self.weaker_model,
+            'stronger_team_color': self.stronger_team_color,
+            'stronger_model': self.stronger_model,
+            'judge_model': self.judge_model,
+            'red_model': self._red_model,
+            'blue_model': self._blue_model,
+        }
+        
     def run_experiments(self) -> pd.DataFrame:
         """
         Run experiments with various team sizes and model strengths, recording the results
@@ -63,6 +129,8 @@ class ModelStrengthExperiment:
         # Calculate total number of games to run
         total_games = len(self.weaker_team_sizes) * len(self.stronger_team_sizes) * self.iterations
         games_completed = 0
+        failed_games = 0
+        api_failures = 0
         
         print(f"\n=== Starting Codenames Model Strength Experiments ===")
         print(f"{self.weaker_team_color} team (weaker model: {self.weaker_model}) sizes: {self.weaker_team_sizes}")
@@ -72,28 +140,22 @@ class ModelStrengthExperiment:
         print(f"Total games to run: {total_games}")
         
         # Create absolute paths for CSV files
-        import os
         base_path = os.path.dirname(os.path.abspath(__file__))
         
         # Define the results file path
         self.results_path = os.path.join(base_path, "model_strength_results.csv")
         print(f"Results will be appended to: {self.results_path}")
         
-        # Check if the results file exists, create it with headers if not
-        if not os.path.exists(self.results_path) or os.path.getsize(self.results_path) == 0:
+        # Open the results file once for the whole run; rows are written as games finish.
+        # Kept local: self is pickled for the game processes, and file handles can't be
+        results_fh = open(self.results_path, 'a', newline='')
+        csv_writer = csv.DictWriter(results_fh, fieldnames=RESULT_COLUMNS)
+        # Append mode starts at the end of the file, so position 0 means a new or empty file
+        if results_fh.tell() == 0:
             print(f"Creating new results file: {self.results_path}")
-            # Create a template dataframe with all the expected columns
-            columns = [
-                'weaker_team_color', 'weaker_team_size', 'weaker_model',
-                'stronger_team_color', 'stronger_team_size', 'stronger_model',
-                'judge_model', 'team_size_ratio', 'iteration', 'winner',
-                'weaker_team_won', 'stronger_team_won', 'turns_played',
-                'win_reason', 'game_duration', 'red_team_size', 'red_model',
-                'blue_team_size', 'blue_model'
-            ]
-            template_df = pd.DataFrame(columns=columns)
-            template_df.to_csv(self.results_path, index=False)
-            print(f"Created new results file with columns: {', '.join(columns)}")
+            csv_writer.writeheader()
+            results_fh.flush()
+            print(f"Created new results file with columns: {', '.join(RESULT_COLUMNS)}")
         else:
             print(f"Appending to existing results file: {self.results_path}")
         
@@ -101,181 +163,233 @@ class ModelStrengthExperiment:
         experiment_start_time = time.time()
         
         try:
-            # Run experiments for each team size combination
-            for weaker_team_size in self.weaker_team_sizes:
-                for stronger_team_size in self.stronger_team_sizes:
-                    print(f"\nTesting with {self.weaker_team_color} team (weaker) size = {weaker_team_size}, "
-                          f"{self.stronger_team_color} team (stronger) size = {stronger_team_size}")
-                    
-                    # Run multiple iterations for each configuration
-                    for iteration in range(1, self.iterations + 1):
-                        try:
-                            # Create a unique seed for this game if a base seed is provided
-                            game_seed = None
-                            if self.seed is not None:
-                                game_seed = self.seed + (weaker_team_size * 10000) + (stronger_team_size * 1000) + iteration
-                            
-                            print(f"  Running iteration {iteration}/{self.iterations}...")
-                            
-                            # Start time for this specific game
-                            game_start_time = time.time()
-                            
-                            # Set up models based on team color
-                            if self.weaker_team_color == "RED":
-                                red_model = self.weaker_model
-                                blue_model = self.stronger_model
-                                red_team_size = weaker_team_size
-                                blue_team_size = stronger_team_size
-                            else:  # weaker team is BLUE
-                                red_model = self.stronger_model
-                                blue_model = self.weaker_model
-                                red_team_size = stronger_team_size
-                                blue_team_size = weaker_team_size
-                            
-                            # Run the game
-                            game_state, game_outcome = play_codenames_game(
-                                team_red_size=red_team_size,
-                                team_blue_size=blue_team_size,
-                                max_turns=self.max_turns,
-                                seed=game_seed,
-                                red_model=red_model,
-                                blue_model=blue_model,
-                                judge_model=self.judge_model
-                            )
-                            
-                            # Calculate game duration
-                            game_duration = time.time() - game_start_time
-                            
-                            # Determine if the weaker team won
-                            winner = game_outcome['winner']
-                            weaker_team_won = (winner == self.weaker_team_color) if winner else False
-                            stronger_team_won = (winner == self.stronger_team_color) if winner else False
-                            
-                            # Record the results
-                            result = {
-                                'weaker_team_color': self.weaker_team_color,
-                                'weaker_team_size': weaker_team_size,
-                                'weaker_model': self.weaker_model,
-                                'stronger_team_color': self.stronger_team_color,
-                                'stronger_team_size': stronger_team_size,
-                                'stronger_model': self.stronger_model,
-                                'judge_model': self.judge_model,
-                                'team_size_ratio': weaker_team_size / stronger_team_size,
-                                'iteration': iteration,
-                                'winner': winner,
-                                'weaker_team_won': 1 if weaker_team_won else 0,
-                                'stronger_team_won': 1 if stronger_team_won else 0,
-                                'turns_played': game_outcome['turns_played'],
-                                'win_reason': game_outcome['win_reason'],
-                                'game_duration': game_outcome['game_duration_seconds'],
-                                'red_team_size': red_team_size,
-                                'red_model': red_model,
-                                'blue_team_size': blue_team_size,
-                                'blue_model': blue_model,
-                            }
-                            
-                            results.append(result)
-                            
-                            # Create a temporary dataframe with the new result
-                            temp_df = pd.DataFrame([result])
-                            
-                            # Append this result to the results file
-                            try:
-                                temp_df.to_csv(self.results_path, mode='a', header=False, index=False)
-                                print(f"  Appended result to: {self.results_path}")
-                            except Exception as e:
-                                print(f"Error appending to results file: {e}")
-                            
-                            # Update progress
-                            games_completed += 1
-                            print(f"  Game completed: {games_completed}/{total_games} ({(games_completed/total_games)*100:.1f}%)")
-                            
-                        except Exception as e:
-                            print(f"Error during game execution: {e}")
-                            # Print traceback
-                            import traceback
+            # One task per game; games are independent and mostly wait on API calls
+            # A unique seed per game if a base seed is provided, for all games at once:
+            # seeds[i, j, k] is the seed of iteration k + 1 with the i-th weaker and j-th stronger team size
+            seeds = None
+            if self.seed is not None:
+                seeds = self.seed + np.add.outer(
+                    np.add.outer(np.array(self.weaker_team_sizes) * 10000, np.array(self.stronger_team_sizes) * 1000),
+                    np.arange(1, self.iterations + 1)
+                )
+            games = []
+            for i, weaker_team_size in enumerate(self.weaker_team_sizes):
+                for j, stronger_team_size in enumerate(self.stronger_team_sizes):
+                    for k in range(self.iterations):
+                        game_seed = int(seeds[i, j, k]) if seeds is not None else None
+                        games.append((weaker_team_size, stronger_team_size, k + 1, game_seed))
+            
+            # Games run in separate processes: the game module keeps the board in
+            # module globals and redirects sys.stdout, so games can't share a process
+            max_workers = self.max_workers or max(1, min(DEFAULT_MAX_WORKERS, total_games))
+            print(f"Running up to {max_workers} games at once")
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {}
+                for i, game in enumerate(games):
+                    if i and self.rate_limit_delay:
+                        time.sleep(self.rate_limit_delay)
+                    futures[executor.submit(self._run_one_game, *game)] = game
+                
+                # Record results in the order games finish
+                last_progress = time.monotonic()
+                for games_finished, future in enumerate(as_completed(futures), 1):
+                    weaker_team_size, stronger_team_size, iteration, game_seed = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Failed games are left out of the results, but always reported
+                        failed_games += 1
+                        print(f"Game failed with {type(e).__name__} (weaker size {weaker_team_size}, "
+                              f"stronger size {stronger_team_size}, iteration {iteration}, seed {game_seed}): {e}")
+                        if isinstance(e, GameAPIError):
+                            # Already retried inside the game; the message says which request failed
+                            api_failures += 1
+                        elif self.verbose_errors:
                             traceback.print_exc()
+                        continue
+                    
+                    results.append(result)
+                    
+                    # Append this result to the results file; flushed so finished games
+                    # are kept if the run is interrupted
+                    try:
+                        csv_writer.writerow(result)
+                        results_fh.flush()
+                        logger.debug("Appended result to: %s", self.results_path)
+                    except Exception as e:
+                        print(f"Error appending to results file: {e}")
+                    
+                    # Update progress, at most every PROGRESS_INTERVAL seconds and after the last game
+                    games_completed += 1
+                    logger.debug("Game completed: %d/%d", games_completed, total_games)
+                    now = time.monotonic()
+                    if games_finished == total_games or now - last_progress >= PROGRESS_INTERVAL:
+                        last_progress = now
+                        print(f"  Games completed: {games_completed}/{total_games} "
+                              f"({(games_completed/total_games)*100:.1f}%)")
                             
         except Exception as e:
             print(f"Exception during experiment: {e}")
-            import traceback
             traceback.print_exc()
         
         finally:
+            results_fh.close()
+            
+            if failed_games:
+                print(f"\n{failed_games} of {total_games} games failed, "
+                      f"{api_failures} of them with network or API provider errors")
+            
             # Create the final dataframe with all results from this run
             if results:
-                self.results_df = pd.DataFrame(results)
+                self.results_df = pd.DataFrame.from_records(results, columns=RESULT_COLUMNS)
                 
                 # Print summary of results for this run
-                self._print_summary()
+                self._print_summary(results)
                 
                 # Also print the combined results from all runs
                 try:
-                    # Read with more flexible error handling
-                    all_results_df = pd.read_csv(self.results_path, on_bad_lines='warn')
-                    
-                    # Ensure we only use the columns we expect
-                    expected_columns = [
-                        'weaker_team_color', 'weaker_team_size', 'weaker_model',
-                        'stronger_team_color', 'stronger_team_size', 'stronger_model',
-                        'judge_model', 'team_size_ratio', 'iteration', 'winner',
-                        'weaker_team_won', 'stronger_team_won', 'turns_played',
-                        'win_reason', 'game_duration', 'red_team_size', 'red_model',
-                        'blue_team_size', 'blue_model'
-                    ]
-                    
-                    # Filter to only columns we need
-                    for col in expected_columns:
-                        if col not in all_results_df.columns:
-                            all_results_df[col] = None
-                    all_results_df = all_results_df[expected_columns]
-                    
-                    print("\n=== Summary of All Experiments ===")
-                    summary = all_results_df.groupby(['weaker_team_size', 'stronger_team_size']).agg({
-                        'weaker_team_won': ['mean', 'count'],
-                        'stronger_team_won': ['mean'],
-                        'turns_played': ['mean'],
-                    }).reset_index()
-                    
-                    # Format column names for better readability
-                    summary.columns = ['weaker_size', 'stronger_size', 'weaker_win_rate', 'games_played', 
-                                      'stronger_win_rate', 'avg_turns']
-                    
-                    # Convert win rates to percentages
-                    summary['weaker_win_rate'] = summary['weaker_win_rate'] * 100
-                    summary['stronger_win_rate'] = summary['stronger_win_rate'] * 100
-                    
-                    print(summary)
-                    print(f"\nTotal games in combined results: {len(all_results_df)}")
-                    
+                    self._summarize_all_results()
                 except Exception as e:
                     print(f"Error analyzing combined results: {e}")
                 
             print(f"\nExperiment completed in {time.time() - experiment_start_time:.2f} seconds")
             return self.results_df
     
-    def _print_summary(self):
-        """Print a summary of the experiment results"""
-        if self.results_df is None or len(self.results_df) == 0:
+    def _run_one_game(self, weaker_team_size: int, stronger_team_size: int,
+                      iteration: int, game_seed: Optional[int]) -> Dict[str, Any]:
+        """
+        Play one game of the experiment and return its result row
+        
+        Args:
+            weaker_team_size: Team size of the weaker model team
+            stronger_team_size: Team size of the stronger model team
+            iteration: Iteration number of this game within its configuration
+            game_seed: Random seed for the game (None for random)
+        """
+        print(f"\nTesting with {self.weaker_team_color} team (weaker) size = {weaker_team_size}, "
+              f"{self.stronger_team_color} team (stronger) size = {stronger_team_size}")
+        print(f"  Running iteration {iteration}/{self.iterations}...")
+        
+        # Team sizes by color
+        if self._is_red_weaker:
+            red_team_size, blue_team_size = weaker_team_size, stronger_team_size
+        else:
+            red_team_size, blue_team_size = stronger_team_size, weaker_team_size
+        
+        # Run the game; transient API failures are retried per request inside the game
+        game_state, game_outcome = play_codenames_game(
+            team_red_size=red_team_size,
+            team_blue_size=blue_team_size,
+            max_turns=self.max_turns,
+            seed=game_seed,
+            debate_rounds=self.debate_rounds,
+            red_model=self._red_model,
+            blue_model=self._blue_model,
+            judge_model=self.judge_model,
+            red_models=None,
+            blue_models=None
+        )
+        
+        # Determine if the weaker team won
+        winner = game_outcome['winner']
+        weaker_team_won = (winner == self.weaker_team_color) if winner else False
+        stronger_team_won = (winner == self.stronger_team_color) if winner else False
+        
+        # Record the results
+        return {
+            **self._static_result_fields,
+            'weaker_team_size': weaker_team_size,
+            'stronger_team_size': stronger_team_size,
+            'team_size_ratio': weaker_team_size / stronger_team_size,
+            'iteration': iteration,
+            'winner': winner,
+            'weaker_team_won': 1 if weaker_team_won else 0,
+            'stronger_team_won': 1 if stronger_team_won else 0,
+            'turns_played': game_outcome['turns_played'],
+            'win_reason': game_outcome['win_reason'],
+            'game_duration': game_outcome['game_duration_seconds'],
+            'red_team_size': red_team_size,
+            'blue_team_size': blue_team_size,
+        }
+    
+    def _summarize_all_results(self, chunksize: int = SUMMARY_CHUNK_SIZE):
+        """
+        Print win rates and average turns per team size combination over the
+        combined results file of all runs.
+        
+        The file is read chunk by chunk and only the summarized columns are
+        loaded; per-group sums and counts are accumulated, so memory stays
+        bounded by one chunk however many runs the file holds.
+        """
+        group_columns = ['weaker_team_size', 'stronger_team_size']
+        value_columns = ['weaker_team_won', 'stronger_team_won', 'turns_played']
+        wanted = set(SUMMARY_DTYPES)
+        
+        partials = []
+        total_games = 0
+        # Read with more flexible error handling. The C engine is used explicitly:
+        # pyarrow supports neither chunksize nor on_bad_lines='warn'
+        reader = pd.read_csv(self.results_path, usecols=lambda column: column in wanted,
+                             dtype=SUMMARY_DTYPES, engine='c', on_bad_lines='warn',
+                             chunksize=chunksize)
+        for chunk in reader:
+            # Older files may lack columns; they count as missing values
+            for column in wanted.difference(chunk.columns):
+                chunk[column] = pd.array([pd.NA] * len(chunk), dtype=SUMMARY_DTYPES[column])
+            # Rows without team sizes can't be grouped; missing values elsewhere are
+            # left out of their column's mean by the sum/count aggregation
+            chunk = chunk.dropna(subset=group_columns)
+            total_games += len(chunk)
+            partials.append(chunk.groupby(group_columns)[value_columns].agg(['sum', 'count']))
+        
+        print("\n=== Summary of All Experiments ===")
+        totals = pd.concat(partials).groupby(level=group_columns).sum()
+        # Means over the non-missing values of each column, as DataFrame.mean computes them
+        summary = pd.DataFrame({
+            'weaker_win_rate': totals[('weaker_team_won', 'sum')] / totals[('weaker_team_won', 'count')],
+            'games_played': totals[('weaker_team_won', 'count')],
+            'stronger_win_rate': totals[('stronger_team_won', 'sum')] / totals[('stronger_team_won', 'count')],
+            'avg_turns': totals[('turns_played', 'sum')] / totals[('turns_played', 'count')],
+        }).reset_index()
+        summary = summary.rename(columns={'weaker_team_size': 'weaker_size', 'stronger_team_size': 'stronger_size'})
+        
+        # Convert win rates to percentages
+        summary['weaker_win_rate'] = summary['weaker_win_rate'] * 100
+        summary['stronger_win_rate'] = summary['stronger_win_rate'] * 100
+        
+        print(summary)
+        print(f"\nTotal games in combined results: {total_games}")
+    
+    def _print_summary(self, results: List[Dict[str, Any]]):
+        """
+        Print win rates, average turns and game duration per team size
+        combination for the results of this run.
+        
+        A run has at most a few hundred rows, so they are tallied in one plain
+        Python pass rather than a pandas groupby.
+        """
+        if not results:
             print("No results to summarize")
             return
         
         print("\n=== Experiment Summary ===")
         
-        # Group by team sizes and calculate win rates
-        summary = self.results_df.groupby(['weaker_team_size', 'stronger_team_size']).agg({
-            'weaker_team_won': 'mean',
-            'stronger_team_won': 'mean',
-            'turns_played': 'mean',
-            'game_duration': 'mean'
-        }).reset_index()
-        
-        # Format win rates as percentages
-        summary['weaker_win_rate'] = summary['weaker_team_won'] * 100
-        summary['stronger_win_rate'] = summary['stronger_team_won'] * 100
+        # (weaker wins, stronger wins, sum of turns, sum of durations, games) per team sizes
+        totals = defaultdict(lambda: [0, 0, 0, 0.0, 0])
+        for result in results:
+            group = totals[(result['weaker_team_size'], result['stronger_team_size'])]
+            group[0] += result['weaker_team_won']
+            group[1] += result['stronger_team_won']
+            group[2] += result['turns_played']
+            group[3] += result['game_duration']
+            group[4] += 1
         
         # Print the summary
-        print(summary[['weaker_team_size', 'stronger_team_size', 'weaker_win_rate', 'stronger_win_rate', 'turns_played', 'game_duration']])
+        print(f"{'weaker_team_size':>16} {'stronger_team_size':>18} {'weaker_win_rate':>15} "
+              f"{'stronger_win_rate':>17} {'turns_played':>12} {'game_duration':>13}")
+        for (weaker_size, stronger_size), (weaker_wins, stronger_wins, turns, duration, n) in sorted(totals.items()):
+            print(f"{weaker_size:>16} {stronger_size:>18} {weaker_wins / n * 100:>15.1f} "
+                  f"{stronger_wins / n * 100:>17.1f} {turns / n:>12.2f} {duration / n:>13.2f}")
         print("\nFull results saved to:", "model_strength_results.csv")
 
 
@@ -290,7 +404,8 @@ def run_model_strength_experiment(
     iterations: int = 1,
     max_turns: int = 20,
     weaker_team_color: str = "RED",
-    seed: int = None
+    seed: int = None,
+    max_workers: Optional[int] = None
 ):
     """
     Run an experiment comparing different model strengths with varying team sizes
@@ -307,6 +422,7 @@ def run_model_strength_experiment(
         max_turns: Maximum number of turns per game
         weaker_team_color: Which team color to assign to the weaker model ("RED" or "BLUE")
         seed: Random seed for reproducibility (None for random)
+        max_workers: Number of games played at once (default: DEFAULT_MAX_WORKERS)
     
     Returns:
         The experiment object containing the results
@@ -324,7 +440,8 @@ def run_model_strength_experiment(
         iterations=iterations,
         max_turns=max_turns,
         weaker_team_color=weaker_team_color,
-        seed=seed
+        seed=seed,
+        max_workers=max_workers
     )
     
     # Run the experiments
@@ -1,5 +1,7 @@
+import csv
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Tuple, Optional
@@ -11,6 +13,18 @@ import argparse # Added argparse
 from updated_play_codenames_game_standalone import play_codenames_game, CardType
 from our_utils import set_stdout_dup_to_file # Added import for logging
 
+# Columns of the results CSV, in file order
+RESULT_COLUMNS = [
+    'run_timestamp', 'game_num', 'red_team_size', 'red_models', 
+    'blue_team_size', 'blue_models', 'judge_model', 'seed',
+    'winner', 'red_team_won', 'blue_team_won', 'turns_played',
+    'win_reason', 'game_duration'
+]
+
+# Games played at once unless max_workers is given; each game sends its API
+# requests one after another, so this keeps a few requests in flight
+DEFAULT_MAX_WORKERS = 4
+
 class TeamDiversityExperiment:
     """Class to run Codenames experiments with varying model strengths and team sizes"""
 
@@ -21,7 +35,9 @@ class TeamDiversityExperiment:
                  num_games: int,
                  max_turns: int,
                  seed: Optional[int] = None,
-                 out_filename: str = "team_diversity_results.csv"):
+                 out_filename: str = "team_diversity_results.csv",
+                 max_workers: Optional[int] = None,
+                 debate_rounds: int = 1):
         """
         Initialize the experiment runner
         
@@ -33,6 +49,9 @@ class TeamDiversityExperiment:
             max_turns: Maximum number of turns per game
             seed: Random seed for reproducibility (None for random)
             out_filename: Name of the CSV file to save results
+            max_workers: Number of games played at once, each in its own process
+                         (default: DEFAULT_MAX_WORKERS, at most one per game)
+            debate_rounds: Number of rounds of debate for each turn
         """
         if not red_models:
             raise ValueError("red_models list cannot be empty.")
@@ -49,6 +68,8 @@ class TeamDiversityExperiment:
         self.seed = seed
         self.results_df = None
         self.out_filename = out_filename
+        self.max_workers = max_workers
+        self.debate_rounds = debate_rounds
         self.timestamp = "" # Initialize timestamp
 
     def run_experiments(self) -> Optional[pd.DataFrame]:
@@ -83,19 +104,15 @@ class TeamDiversityExperiment:
         self.results_path = os.path.join(base_path, self.out_filename)
         print(f"Results will be appended to: {self.results_path}")
         
-        # Check if the results file exists, create it with headers if not
-        if not os.path.exists(self.results_path) or os.path.getsize(self.results_path) == 0:
+        # Open the results file once for the whole run; rows are written as games finish
+        results_fh = open(self.results_path, 'a', newline='')
+        csv_writer = csv.DictWriter(results_fh, fieldnames=RESULT_COLUMNS)
+        # Append mode starts at the end of the file, so position 0 means a new or empty file
+        if results_fh.tell() == 0:
             print(f"Creating new results file: {self.results_path}")
-            # Define the columns for the results CSV
-            columns = [
-                'run_timestamp', 'game_num', 'red_team_size', 'red_models', 
-                'blue_team_size', 'blue_models', 'judge_model', 'seed',
-                'winner', 'red_team_won', 'blue_team_won', 'turns_played',
-                'win_reason', 'game_duration'
-            ]
-            template_df = pd.DataFrame(columns=columns)
-            template_df.to_csv(self.results_path, index=False)
-            print(f"Created new results file with columns: {', '.join(columns)}")
+            csv_writer.writeheader()
+            results_fh.flush()
+            print(f"Created new results file with columns: {', '.join(RESULT_COLUMNS)}")
         else:
             print(f"Appending to existing results file: {self.results_path}")
         
@@ -103,88 +120,43 @@ class TeamDiversityExperiment:
         experiment_start_time = time.time()
         
         try:
-            # Run the specified number of games
-            for game_num in range(1, self.num_games + 1):
-                try:
-                    # Create a unique seed for this game if a base seed is provided
-                    game_seed = None
-                    if self.seed is not None:
-                        # Simple way to generate a unique seed for each game in the run
-                        game_seed = self.seed + game_num 
-                    
-                    print(f"  Running game {game_num}/{self.num_games} (Seed: {game_seed})...")
-                    
-                    # Start time for this specific game
-                    game_start_time = time.time()
-                    
-                    # Run the game
-                    game_state, game_outcome = play_codenames_game(
-                        team_red_size=self.red_team_size,
-                        team_blue_size=self.blue_team_size,
-                        max_turns=self.max_turns,
-                        seed=game_seed,
-                        red_models=self.red_models,
-                        blue_models=self.blue_models,
-                        judge_model=self.judge_model
-                    )
-                    
-                    # Calculate game duration (using duration from game_outcome if available)
-                    game_duration = game_outcome.get('game_duration_seconds', time.time() - game_start_time)
-                    
-                    # Determine winner and win flags
-                    winner = game_outcome.get('winner')
-                    red_team_won = (winner == 'RED') if winner else False
-                    blue_team_won = (winner == 'BLUE') if winner else False
-                    
-                    # Record the results
-                    result = {
-                        'run_timestamp': self.timestamp,
-                        'game_num': game_num,
-                        'red_team_size': self.red_team_size,
-                        'red_models': ",".join(self.red_models),
-                        'blue_team_size': self.blue_team_size,
-                        'blue_models': ",".join(self.blue_models),
-                        'judge_model': self.judge_model,
-                        'seed': game_seed, # Record the actual seed used
-                        'winner': winner,
-                        'red_team_won': 1 if red_team_won else 0,
-                        'blue_team_won': 1 if blue_team_won else 0,
-                        'turns_played': game_outcome.get('turns_played'),
-                        'win_reason': game_outcome.get('win_reason'),
-                        'game_duration': game_duration
-                    }
+            # Create a unique seed for each game if a base seed is provided
+            games = [(game_num, self.seed + game_num if self.seed is not None else None)
+                     for game_num in range(1, self.num_games + 1)]
+            
+            # Games run in separate processes: the game module keeps the board in
+            # module globals and redirects sys.stdout, so games can't share a process
+            max_workers = self.max_workers or max(1, min(DEFAULT_MAX_WORKERS, total_games))
+            print(f"Running up to {max_workers} games at once")
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(self._run_one_game, *game): game for game in games}
+                
+                # Record results in the order games finish
+                for future in as_completed(futures):
+                    game_num, _ = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Error during game execution (Game {game_num}): {e}")
+                        import traceback
+                        traceback.print_exc()
+                        continue
                     
                     results.append(result)
                     
-                    # Create a temporary dataframe with the new result
-                    temp_df = pd.DataFrame([result])
-                    
-                    # Append this result to the results file
+                    # Append this result to the results file; flushed so finished games
+                    # are kept if the run is interrupted
                     try:
-                        # Ensure columns match the file header order
-                        if os.path.exists(self.results_path):
-                            existing_cols = pd.read_csv(self.results_path, nrows=0).columns.tolist()
-                            temp_df = temp_df[existing_cols] # Reorder columns to match file
-                            
-                        temp_df.to_csv(self.results_path, mode='a', header=False, index=False)
+                        csv_writer.writerow(result)
+                        results_fh.flush()
                         print(f"  Appended result to: {self.results_path}")
                     except Exception as e:
-                        print(f"Error appending to results file: {e}. Trying without column matching.")
-                        # Fallback: append raw dict if column matching fails
-                        pd.DataFrame([result]).to_csv(self.results_path, mode='a', header=False, index=False)
-
+                        print(f"Error appending to results file: {e}")
 
                     # Update progress
                     games_completed += 1
                     progress_percent = (games_completed / total_games) * 100 if total_games > 0 else 0
                     print(f"  Game completed: {games_completed}/{total_games} ({progress_percent:.1f}%)")
-                    
-                except Exception as e:
-                    print(f"Error during game execution (Game {game_num}): {e}")
-                    import traceback
-                    traceback.print_exc()
-                    # Optionally add a placeholder result indicating failure
-                    # results.append({ 'run_timestamp': self.timestamp, 'game_num': game_num, 'error': str(e), ... })
                             
         except Exception as e:
             print(f"Exception during experiment setup or loop: {e}")
@@ -192,6 +164,8 @@ class TeamDiversityExperiment:
             traceback.print_exc()
         
         finally:
+            results_fh.close()
+            
             # Create the final dataframe with all results from this specific run
             if results:
                 self.results_df = pd.DataFrame(results)
@@ -210,6 +184,60 @@ class TeamDiversityExperiment:
             print(f"Experiment run completed in {run_duration:.2f} seconds")
             return self.results_df # Return results from this run
     
+    def _run_one_game(self, game_num: int, game_seed: Optional[int]) -> Dict[str, Any]:
+        """
+        Play one game of the experiment and return its result row
+        
+        Args:
+            game_num: Number of the game within this run
+            game_seed: Random seed for the game (None for random)
+        """
+        print(f"  Running game {game_num}/{self.num_games} (Seed: {game_seed})...")
+        
+        # Start time for this specific game
+        game_start_time = time.time()
+        
+        # Run the game; the team models are given by red_models / blue_models,
+        # red_model / blue_model only name the first of them
+        game_state, game_outcome = play_codenames_game(
+            team_red_size=self.red_team_size,
+            team_blue_size=self.blue_team_size,
+            max_turns=self.max_turns,
+            seed=game_seed,
+            debate_rounds=self.debate_rounds,
+            red_model=self.red_models[0],
+            blue_model=self.blue_models[0],
+            judge_model=self.judge_model,
+            red_models=self.red_models,
+            blue_models=self.blue_models
+        )
+        
+        # Calculate game duration (using duration from game_outcome if available)
+        game_duration = game_outcome.get('game_duration_seconds', time.time() - game_start_time)
+        
+        # Determine winner and win flags
+        winner = game_outcome.get('winner')
+        red_team_won = (winner == 'RED') if winner else False
+        blue_team_won = (winner == 'BLUE') if winner else False
+        
+        # Record the results
+        return {
+            'run_timestamp': self.timestamp,
+            'game_num': game_num,
+            'red_team_size': self.red_team_size,
+            'red_models': ",".join(self.red_models),
+            'blue_team_size': self.blue_team_size,
+            'blue_models': ",".join(self.blue_models),
+            'judge_model': self.judge_model,
+            'seed': game_seed, # Record the actual seed used
+            'winner': winner,
+            'red_team_won': 1 if red_team_won else 0,
+            'blue_team_won': 1 if blue_team_won else 0,
+            'turns_played': game_outcome.get('turns_played'),
+            'win_reason': game_outcome.get('win_reason'),
+            'game_duration': game_duration
+        }
+    
     def _print_run_summary(self):
         """Print a summary of the results from the current experiment run"""
         if self.results_df is None or self.results_df.empty:
@@ -372,6 +400,8 @@ if __name__ == "__main__":
     parser.add_argument("--max-turns", type=int, default=20, help="Maximum number of turns per game.")
     parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducibility.")
     parser.add_argument("--out-filename", default="team_diversity_results.csv", help="Name of the CSV file to save results.")
+    parser.add_argument("--debate-rounds", type=int, default=1, help="Number of rounds of debate for each turn.")
+    parser.add_argument("--max-workers", type=int, default=None, help=f"Number of games to play at once (default: {DEFAULT_MAX_WORKERS}).")
     parser.add_argument("--log-file", type=str, default=None, help="Optional path to redirect stdout/stderr to a log file.")
 
     args = parser.parse_args()
@@ -388,6 +418,7 @@ if __name__ == "__main__":
     print(f"Judge Model: {args.judge_model}")
     print(f"Number of Games: {args.num_games}")
     print(f"Max Turns: {args.max_turns}")
+    print(f"Debate Rounds: {args.debate_rounds}")
     print(f"Seed: {args.seed}")
     print(f"Output File: {args.out_filename}")
     if args.log_file:
@@ -402,7 +433,9 @@ if __name__ == "__main__":
         num_games=args.num_games,
         max_turns=args.max_turns,
         seed=args.seed,
-        out_filename=args.out_filename
+        out_filename=args.out_filename,
+        max_workers=args.max_workers,
+        debate_rounds=args.debate_rounds
     )
     
     experiment.run_experiments()
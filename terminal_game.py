@@ -166,17 +166,18 @@ class TerminalGameManager:
         print()
         
         # Display clue history
-        if game_state.clue_history:
+        clue_history = game_state.clue_history
+        if clue_history:
             print("--- CLUE HISTORY ---")
-            for team, clue, number in game_state.clue_history:
-                print(f"{team.value.upper()}: \"{clue}\" for {number}")
+            for clue in clue_history:
+                print(f"{clue.team.value.upper()}: \"{clue.word}\" for {clue.count}")
         
         print("-----------------------\n")
     
     def _get_ai_clue(self, spymaster: Player) -> Tuple[str, int]:
         """Get a clue from an AI spymaster"""
         game_state = self.engine.get_game(self.game_id)
-        board_state = game_state.get_spymaster_state(spymaster.team)
+        board_state = game_state.get_spymaster_state()
         
         # Prepare the message for the AI
         team_words = []
@@ -241,7 +242,7 @@ Respond with only the clue word and number, separated by a space. For example: "
             Tuple of (guess_word, confidence)
         """
         game_state = self.engine.get_game(self.game_id)
-        board_state = game_state.get_visible_state(operative.team)
+        board_state = game_state.get_visible_state()
         
         # Check if this is a bonus guess
         is_bonus_guess = guesses_made >= number
@@ -5,12 +5,19 @@ Tests the functionality of AI agent implementations.
 
 import unittest
 from unittest.mock import patch, MagicMock
+from concurrent.futures import CancelledError
 import json
+import os
+import tempfile
+import threading
+
+import openai
 
 from codenames.game import CardType, Card, GameState
-from codenames.agents.spymaster import SpymasterAgent
-from codenames.agents.operative import OperativeAgent
+from codenames.agents.spymaster import ClueCache, SpymasterAgent
+from codenames.agents.operative import OperativeAgent, format_board_context, format_debate_entry
 from codenames.agents.debates import DebateManager
+from codenames.agents import api
 
 
 class TestSpymasterAgent(unittest.TestCase):
@@ -43,6 +50,10 @@ class TestSpymasterAgent(unittest.TestCase):
     @patch('openai.OpenAI')
     def test_make_api_call(self, mock_openai):
         """Test making an API call"""
+        # Use a client from the patched openai.OpenAI
+        api.close_client()
+        self.addCleanup(api.close_client)
+        
         # Set up mock
         mock_client = MagicMock()
         mock_openai.return_value = mock_client
@@ -95,6 +106,60 @@ TARGETS: apple, banana
         self.assertEqual(self.agent.decisions[0]["parsed"]["number"], 2)
         self.assertEqual(self.agent.decisions[0]["parsed"]["targets"], ["apple", "banana"])
     
+    @patch('codenames.agents.spymaster.chat_completion')
+    def test_generate_clue_streaming(self, mock_chat_completion):
+        """Test that a streamed clue reaches on_clue before the targets are received"""
+        deltas = ["CLUE: fr", "uit\nNUMBER: 2", "\nTARGETS: apple", ", banana"]
+        received = []
+        seen_by_clue = []
+        
+        def stream():
+            for delta in deltas:
+                received.append(delta)
+                chunk = MagicMock()
+                chunk.choices[0].delta.content = delta
+                yield chunk
+        
+        mock_chat_completion.return_value = stream()
+        
+        def on_clue(clue_word, clue_number):
+            seen_by_clue.append((clue_word, clue_number, len(received)))
+        
+        clue = self.agent.generate_clue(self.game_state, on_clue=on_clue)
+        
+        self.assertTrue(mock_chat_completion.call_args[1]["stream"])
+        self.assertEqual(seen_by_clue, [("fruit", 2, 3)])
+        self.assertEqual(clue, ("fruit", 2, ["apple", "banana"]))
+    
+    @patch.object(SpymasterAgent, 'make_api_call')
+    def test_generate_clue_cache(self, mock_make_api_call):
+        """Test that clues for a board state seen before are read from the cache"""
+        mock_make_api_call.return_value = "CLUE: fruit\nNUMBER: 2\nTARGETS: apple, banana"
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_path = os.path.join(cache_dir, "codenames", "clues.json")
+            self.agent.clue_cache = ClueCache(cache_path)
+            self.agent.generate_clue(self.game_state)
+            
+            # A new cache on the same file, as in a later run, answers without an API call
+            self.agent.clue_cache = ClueCache(cache_path)
+            clue = self.agent.generate_clue(self.game_state)
+            mock_make_api_call.assert_called_once()
+            self.assertEqual(clue, ("fruit", 2, ["apple", "banana"]))
+            
+            # Revealing a card changes the key
+            self.game_state.reveal(0)
+            self.agent.generate_clue(self.game_state)
+            self.assertEqual(mock_make_api_call.call_count, 2)
+            
+            # So does a board with the same words but different card types
+            swapped = [Card(card.word, CardType.BLUE if card.type == CardType.RED else card.type, card.revealed)
+                       for card in self.game_state.board]
+            swapped_state = GameState(game_id="swapped", board=swapped, red_remaining=0, blue_remaining=3,
+                                      current_team=CardType.RED)
+            self.agent.generate_clue(swapped_state)
+            self.assertEqual(mock_make_api_call.call_count, 3)
+    
     def test_word_similarity(self):
         """Test the word similarity function"""
         # Same words
@@ -188,6 +253,12 @@ REASONING: This word seems most related to the clue 'fruit'.
         
         # Check the response
         self.assertEqual(response, "I think apple is the best guess because it's clearly a fruit.")
+        
+        # A pre-formatted transcript gives the same prompt
+        transcript = "".join(map(format_debate_entry, debate_log))
+        self.agent.debate_response(debate_log, self.game_state, "fruit", 2, transcript=transcript)
+        self.assertEqual(mock_make_api_call.call_args_list[0], mock_make_api_call.call_args_list[1])
+        self.assertIn("Agent1: I suggest we guess 'banana'....", mock_make_api_call.call_args[0][1])
     
     @patch.object(OperativeAgent, 'make_api_call')
     def test_final_vote(self, mock_make_api_call):
@@ -222,6 +293,30 @@ REASONING: This word seems most related to the clue 'fruit'.
         
         # Check the vote
         self.assertEqual(vote, "apple")
+    
+    @patch.object(OperativeAgent, 'make_api_call', return_value="banana")
+    @patch.object(OperativeAgent, 'make_api_calls')
+    def test_final_vote_batch(self, mock_make_api_calls, mock_make_api_call):
+        """Test casting final votes for several agents in one request"""
+        mock_make_api_calls.return_value = ["Apple.", "'end'", "kiwi"]
+        agents = [OperativeAgent(name=f"Agent{i}", team=CardType.RED) for i in range(3)]
+        debate_log = [{"round": 2, "agent": "Agent0", "message": "I think apple is better.", "guess": "apple"}]
+        options = ["apple", "banana", "end"]
+        
+        votes = OperativeAgent.final_vote_batch(agents, debate_log, options, self.game_state, "fruit", 2)
+        
+        # One request for all three agents, invalid votes default to "end"
+        mock_make_api_calls.assert_called_once()
+        self.assertEqual(mock_make_api_calls.call_args[0][2], 3)
+        mock_make_api_call.assert_not_called()
+        self.assertEqual(votes, ["apple", "end", "end"])
+        
+        # Agents on different teams see different prompts, so they are asked one by one
+        agents[2].team = CardType.BLUE
+        votes = OperativeAgent.final_vote_batch(agents, debate_log, options, self.game_state, "fruit", 2)
+        mock_make_api_calls.assert_called_once()
+        self.assertEqual(mock_make_api_call.call_count, 3)
+        self.assertEqual(votes, ["banana", "banana", "banana"])
 
 
 class TestDebateManager(unittest.TestCase):
@@ -290,6 +385,168 @@ class TestDebateManager(unittest.TestCase):
         self.assertEqual(result["final_decision"], "apple")
         self.assertEqual(result["vote_counts"], {"apple": 2})
         self.assertEqual(len(result["debate_log"]), 4)  # 2 initial proposals + 2 debate responses
+        
+        # The board is rendered once and shared by every prompt
+        board_context = format_board_context(self.game_state)
+        self.assertEqual(mock_generate_guess.call_args[1]["board_context"], board_context)
+        self.assertEqual(mock_debate_response.call_args[1]["board_context"], board_context)
+    
+    def test_run_debate_agent_prompts(self):
+        """Test a debate between real agents, with only the API call stubbed"""
+        agents = [OperativeAgent(name=f"Agent{i}", team=CardType.RED) for i in range(2)]
+        proposals = {"Agent0": "apple", "Agent1": "banana"}
+        
+        def make_api_call(agent, system_message, user_message):
+            if "DEBATE SO FAR" in user_message:
+                return "I now think 'apple' is the best guess"
+            if "OPTIONS TO VOTE FOR" in user_message:
+                return "apple"
+            return f"DECISION: {proposals[agent.name]}\nREASONING: It is a fruit"
+        
+        with patch.object(OperativeAgent, 'make_api_call', autospec=True, side_effect=make_api_call):
+            result = DebateManager(max_rounds=2).run_debate(agents, self.game_state, "fruit", 2, 0, [])
+        
+        self.assertEqual([entry["guess"] for entry in result["debate_log"]], ["apple", "banana", "apple", "apple"])
+        self.assertEqual(result["final_decision"], "apple")
+        self.assertEqual(result["vote_counts"], {"apple": 2})
+    
+    @patch('codenames.agents.debates.random.choice', return_value="apple")
+    @patch.object(OperativeAgent, 'debate_response', return_value="Still undecided")
+    @patch.object(OperativeAgent, 'final_vote')
+    def test_run_debate_tie(self, mock_final_vote, mock_debate_response, mock_choice):
+        """Test that a tied vote is broken randomly among the tied options"""
+        agents = [OperativeAgent(name=f"Agent{i}", team=CardType.RED) for i in range(2)]
+        proposals = {"Agent0": "apple", "Agent1": "banana"}
+        mock_final_vote.side_effect = ["apple", "banana"]
+        
+        with patch.object(OperativeAgent, 'generate_guess',
+                          lambda agent, *args, **kwargs: (proposals[agent.name], "It is a fruit", 0.5)):
+            result = self.debate_manager.run_debate(agents, self.game_state, "fruit", 2, 0, [])
+        
+        self.assertEqual(result["vote_counts"], {"apple": 1, "banana": 1})
+        self.assertEqual(sorted(mock_choice.call_args[0][0]), ["apple", "banana"])
+        self.assertEqual(result["final_decision"], "apple")
+        self.assertEqual(result["reasoning"], ["Agent0: I suggest we guess 'apple'.\nMy reasoning: It is a fruit"])
+    
+    @patch.object(OperativeAgent, 'generate_guess', return_value=("apple", "Apple is a fruit", 0.5))
+    @patch.object(OperativeAgent, 'debate_response')
+    @patch.object(OperativeAgent, 'final_vote')
+    def test_run_debate_unanimous(self, mock_final_vote, mock_debate_response, mock_generate_guess):
+        """Test that unanimous proposals are accepted without discussion or a vote"""
+        agents = [OperativeAgent(name=f"Agent{i}", team=CardType.RED) for i in range(2)]
+        
+        result = self.debate_manager.run_debate(agents, self.game_state, "fruit", 2, 0, [])
+        
+        mock_debate_response.assert_not_called()
+        mock_final_vote.assert_not_called()
+        self.assertEqual(result["final_decision"], "apple")
+        self.assertEqual(result["vote_counts"], {"apple": 2})
+        self.assertEqual(result["reasoning"], [
+            "Agent0: I suggest we guess 'apple'.\nMy reasoning: Apple is a fruit",
+            "Agent1: I suggest we guess 'apple'.\nMy reasoning: Apple is a fruit",
+        ])
+    
+    @patch.object(OperativeAgent, 'debate_response', return_value="I agree with 'apple'")
+    @patch.object(OperativeAgent, 'final_vote', return_value="apple")
+    def test_run_debate_supermajority(self, mock_final_vote, mock_debate_response):
+        """Test that discussion stops once two thirds of the agents agree"""
+        agents = [OperativeAgent(name=f"Agent{i}", team=CardType.RED) for i in range(3)]
+        debate_manager = DebateManager(max_rounds=3)
+        
+        # Split proposals: one discussion round, which brings everyone to apple
+        proposals = {"Agent0": "apple", "Agent1": "banana", "Agent2": "cherry"}
+        with patch.object(OperativeAgent, 'generate_guess',
+                          lambda agent, *args, **kwargs: (proposals[agent.name], "reason", 0.5)):
+            result = debate_manager.run_debate(agents, self.game_state, "fruit", 2, 0, [])
+        self.assertEqual(mock_debate_response.call_count, 3)
+        self.assertEqual(max(entry["round"] for entry in result["debate_log"]), 2)
+        
+        # Two of three proposals agree: no discussion at all
+        proposals["Agent1"] = "apple"
+        mock_debate_response.reset_mock()
+        with patch.object(OperativeAgent, 'generate_guess',
+                          lambda agent, *args, **kwargs: (proposals[agent.name], "reason", 0.5)):
+            result = debate_manager.run_debate(agents, self.game_state, "fruit", 2, 0, [])
+        mock_debate_response.assert_not_called()
+        self.assertEqual(result["final_decision"], "apple")
+    
+    @patch.object(OperativeAgent, 'final_vote', return_value="apple")
+    def test_run_debate_cache(self, mock_final_vote):
+        """Test that a repeated debate on the same board reuses the earlier decision"""
+        agents = [OperativeAgent(name=f"Agent{i}", team=CardType.RED) for i in range(2)]
+        debate_manager = DebateManager(max_rounds=2, cache_size=1)
+        
+        with patch.object(OperativeAgent, 'generate_guess', return_value=("apple", "Apple is a fruit")) as mock_generate_guess:
+            first = debate_manager.run_debate(agents, self.game_state, "fruit", 2, 0, [])
+            first["debate_log"].clear()
+            second = debate_manager.run_debate(agents, self.game_state, "Fruit", 2, 0, [])
+            self.assertEqual(mock_generate_guess.call_count, 2)
+            
+            self.assertFalse(first["cached"])
+            self.assertTrue(second["cached"])
+            self.assertEqual(second["final_decision"], "apple")
+            self.assertEqual(len(second["debate_log"]), 2)
+            
+            # A different clue is debated again, and evicts the first one
+            debate_manager.run_debate(agents, self.game_state, "tree", 2, 0, [])
+            debate_manager.run_debate(agents, self.game_state, "fruit", 2, 0, [])
+            self.assertEqual(mock_generate_guess.call_count, 6)
+            
+            # The same clue after a different guess history is debated again
+            previous_guesses = [{"word": "banana", "correct": True, "revealed_type": "red"}]
+            third = debate_manager.run_debate(agents, self.game_state, "fruit", 2, 1, previous_guesses)
+            self.assertFalse(third["cached"])
+            self.assertEqual(mock_generate_guess.call_count, 8)
+            fourth = debate_manager.run_debate(agents, self.game_state, "fruit", 2, 1, previous_guesses)
+            self.assertTrue(fourth["cached"])
+    
+    @patch.object(OperativeAgent, 'debate_response', return_value="I prefer 'banana'")
+    @patch.object(OperativeAgent, 'final_vote', return_value="banana")
+    def test_run_debate_cancelled(self, mock_final_vote, mock_debate_response):
+        """Test that a cancelled debate stops before its next agent call"""
+        agents = [OperativeAgent(name=f"Agent{i}", team=CardType.RED) for i in range(2)]
+        debate_manager = DebateManager(max_rounds=2, cache_size=1)
+        cancel_event = threading.Event()
+        
+        def generate_guess(agent, *args, **kwargs):
+            # The clue changes while the proposals are being made
+            cancel_event.set()
+            return ({"Agent0": "apple"}.get(agent.name, "banana"), "reason", 0.5)
+        
+        with patch.object(OperativeAgent, 'generate_guess', generate_guess):
+            with self.assertRaises(CancelledError):
+                debate_manager.run_debate(agents, self.game_state, "fruit", 2, 0, [], cancel_event=cancel_event)
+        mock_debate_response.assert_not_called()
+        mock_final_vote.assert_not_called()
+        # A cancelled debate isn't cached
+        self.assertEqual(len(debate_manager._cache), 0)
+    
+    @patch('codenames.agents.debates.MIN_CALL_TIMEOUT', 0.05)
+    @patch.object(OperativeAgent, 'debate_response', return_value="Still undecided")
+    @patch.object(OperativeAgent, 'final_vote', return_value="banana")
+    def test_run_debate_budget(self, mock_final_vote, mock_debate_response):
+        """Test that agents who miss the time budget are left out"""
+        agents = [OperativeAgent(name=f"Agent{i}", team=CardType.RED) for i in range(3)]
+        debate_manager = DebateManager(max_rounds=2, budget_s=0.05)
+        release = threading.Event()
+        
+        def generate_guess(agent, *args, **kwargs):
+            if agent.name == "Agent2":
+                release.wait(5)
+            return ({"Agent0": "apple", "Agent1": "banana"}.get(agent.name, "cherry"), "reason", 0.5)
+        
+        try:
+            with patch.object(OperativeAgent, 'generate_guess', generate_guess):
+                result = debate_manager.run_debate(agents, self.game_state, "fruit", 2, 0, [])
+        finally:
+            release.set()
+        
+        # The straggler makes no proposal, but still takes part afterwards
+        proposers = [entry["agent"] for entry in result["debate_log"] if entry["round"] == 1]
+        self.assertEqual(proposers, ["Agent0", "Agent1"])
+        self.assertEqual(mock_debate_response.call_count, 3)
+        self.assertEqual(result["final_decision"], "banana")
+        self.assertEqual(result["vote_counts"], {"banana": 3})
     
     def test_extract_preference(self):
         """Test extracting a preference from a message"""
@@ -314,5 +571,74 @@ class TestDebateManager(unittest.TestCase):
         self.assertIsNone(preference)
 
 
+
+class TestChatCompletion(unittest.TestCase):
+    """Tests for the shared chat completion helper"""
+    
+    def setUp(self):
+        """Start without a shared client, so the patched openai.OpenAI is used"""
+        api.close_client()
+    
+    def tearDown(self):
+        """Lift any Retry-After pause, so it doesn't slow down later tests"""
+        api._paused_until = 0.0
+        api.close_client()
+    
+    @staticmethod
+    def _rate_limit_error(headers=None):
+        response = MagicMock(status_code=429, headers=headers or {})
+        return openai.RateLimitError("Rate limit reached", response=response, body=None)
+    
+    @patch('codenames.agents.api.time.sleep')
+    @patch('openai.OpenAI')
+    def test_retries_rate_limit_errors(self, mock_openai, mock_sleep):
+        """Test that rate limited requests are retried, honoring Retry-After"""
+        create = mock_openai.return_value.chat.completions.create
+        create.side_effect = [
+            self._rate_limit_error(),
+            self._rate_limit_error({"retry-after": "2"}),
+            "completion"
+        ]
+        
+        self.assertEqual(api.chat_completion("gpt-4o", "System message", "User message", n=2), "completion")
+        self.assertEqual(create.call_count, 3)
+        self.assertEqual(create.call_args[1]["n"], 2)
+        # All attempts share one client
+        mock_openai.assert_called_once()
+        
+        # Backoff after the first error, then the Retry-After pause before the third attempt
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertTrue(api.MIN_BACKOFF <= mock_sleep.call_args_list[0][0][0] <= api.MAX_BACKOFF)
+        self.assertAlmostEqual(mock_sleep.call_args_list[1][0][0], 2, delta=0.5)
+    
+    @patch('openai.OpenAI')
+    def test_stream_holds_request_slot(self, mock_openai):
+        """Test that a streamed request counts against MAX_CONCURRENCY until it is consumed"""
+        create = mock_openai.return_value.chat.completions.create
+        create.side_effect = lambda **kwargs: iter(["chunk1", "chunk2"])
+        
+        stream = api.chat_completion("gpt-4o", "System message", "User message", stream=True)
+        self.assertEqual(api._semaphore._value, api.MAX_CONCURRENCY - 1)
+        self.assertEqual(list(stream), ["chunk1", "chunk2"])
+        self.assertEqual(api._semaphore._value, api.MAX_CONCURRENCY)
+        
+        # A stream closed without being read gives its slot back too
+        stream = api.chat_completion("gpt-4o", "System message", "User message", stream=True)
+        stream.close()
+        stream.close()
+        self.assertEqual(api._semaphore._value, api.MAX_CONCURRENCY)
+    
+    @patch('codenames.agents.api.time.sleep')
+    @patch('openai.OpenAI')
+    def test_gives_up_after_max_attempts(self, mock_openai, mock_sleep):
+        """Test that the last rate limit error is raised"""
+        create = mock_openai.return_value.chat.completions.create
+        create.side_effect = self._rate_limit_error()
+        
+        with self.assertRaises(openai.RateLimitError):
+            api.chat_completion("gpt-4o", "System message", "User message")
+        self.assertEqual(create.call_count, api.MAX_ATTEMPTS)
+
+
 if __name__ == "__main__":
     unittest.main()
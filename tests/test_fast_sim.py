@@ -0,0 +1,109 @@
+"""
+Unit tests for the batched game simulator.
+Checks that fast_sim plays by the same rules as the GameEngine.
+"""
+
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from codenames.game import CardType, Card, GameState, GameEngine, _CARD_TYPE_CODE, _CODE_CARD_TYPE
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestFastSim(unittest.TestCase):
+    """Tests for codenames.fast_sim"""
+
+    def setUp(self):
+        from codenames import fast_sim
+        self.fast_sim = fast_sim
+
+    def test_random_boards(self):
+        """Test board composition and reproducibility"""
+        board_types, first_team = self.fast_sim.random_boards(200, seed=1)
+        self.assertEqual(board_types.shape, (200, 25))
+        for types, first in zip(board_types, first_team):
+            counts = np.bincount(types, minlength=4)
+            self.assertEqual(counts[first], 9)
+            self.assertEqual(counts[1 - first], 8)
+            self.assertEqual(counts[self.fast_sim.NEUTRAL], 7)
+            self.assertEqual(counts[self.fast_sim.ASSASSIN], 1)
+
+        again, _ = self.fast_sim.random_boards(200, seed=1)
+        self.assertTrue(np.array_equal(board_types, again))
+
+    def test_apply_guess(self):
+        """Test a single guess on one board"""
+        fs = self.fast_sim
+        board_types = np.array([fs.RED, fs.BLUE, fs.NEUTRAL, fs.ASSASSIN], dtype=np.int8)
+        revealed = np.zeros(4, dtype=np.bool_)
+
+        # Own card: the turn continues
+        self.assertEqual(fs.apply_guess(board_types, revealed, 0, fs.RED, 2, 1), (True, 1, 1, fs.NO_WINNER, fs.RED))
+        self.assertTrue(revealed[0])
+        # Already revealed: nothing changes
+        self.assertEqual(fs.apply_guess(board_types, revealed, 0, fs.RED, 1, 1), (False, 1, 1, fs.NO_WINNER, fs.RED))
+        # Last opponent card: the opponent wins
+        self.assertEqual(fs.apply_guess(board_types, revealed, 1, fs.RED, 1, 1), (True, 1, 0, fs.BLUE, fs.BLUE))
+        # Assassin: the guessing team loses
+        self.assertEqual(fs.apply_guess(board_types, revealed, 3, fs.BLUE, 1, 0), (True, 1, 0, fs.RED, fs.RED))
+
+    def test_simulate_matches_engine(self):
+        """Test that simulate agrees with GameEngine on the same guesses"""
+        rng = np.random.default_rng(3)
+        n_games = 50
+
+        def policy(board_types, first_team):
+            # Random card order with an occasional pass
+            guesses = np.full((len(board_types), 30), self.fast_sim.END_TURN, dtype=np.int32)
+            for g in range(len(board_types)):
+                order = rng.permutation(25)
+                moves = [i for idx in order for i in ([idx] if rng.random() > 0.2 else [-1, idx])]
+                guesses[g, :min(len(moves), 30)] = moves[:30]
+            return guesses
+
+        board_types, first_team = self.fast_sim.random_boards(n_games, seed=5)
+        guesses = policy(board_types, first_team)
+        winners, turn_counts, revealed = self.fast_sim.simulate(board_types, first_team, guesses)
+
+        engine = GameEngine([])
+        for g in range(n_games):
+            board = [Card(word=f"w{i}", type=_CODE_CARD_TYPE[int(t)]) for i, t in enumerate(board_types[g])]
+            first = _CODE_CARD_TYPE[int(first_team[g])]
+            engine.games["g"] = GameState(
+                game_id="g",
+                board=board,
+                red_remaining=sum(card.type == CardType.RED for card in board),
+                blue_remaining=sum(card.type == CardType.BLUE for card in board),
+                current_team=first,
+            )
+            game = engine.games["g"]
+            for idx in guesses[g]:
+                if game.winner:
+                    break
+                if idx == self.fast_sim.END_TURN:
+                    engine.end_turn("g", game.current_team)
+                else:
+                    engine.process_guess("g", f"w{idx}", game.current_team)
+
+            expected_winner = self.fast_sim.NO_WINNER if game.winner is None else _CARD_TYPE_CODE[game.winner]
+            self.assertEqual(winners[g], expected_winner)
+            self.assertEqual(turn_counts[g], game.turn_count)
+            self.assertEqual(list(revealed[g]), [card.revealed for card in board])
+
+    def test_simulate_batch(self):
+        """Test simulate_batch with a policy that always passes"""
+        def policy(board_types, first_team):
+            return np.full((len(board_types), 3), self.fast_sim.END_TURN)
+
+        winners, turn_counts, revealed = self.fast_sim.simulate_batch(10, policy, seed=0)
+        self.assertTrue((winners == self.fast_sim.NO_WINNER).all())
+        self.assertTrue((turn_counts == 3).all())
+        self.assertFalse(revealed.any())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,9 +5,10 @@ Tests the functionality of game entities and the game engine.
 
 import unittest
 from unittest.mock import patch, MagicMock
+import json
 import random
 
-from codenames.game import CardType, Card, Player, GameState, GameEngine
+from codenames.game import CardType, Card, Player, GameState, GameEngine, GuessResult, _CARD_TYPE_CODE, _CODE_CARD_TYPE
 from codenames.words import WORD_LIST
 
 
@@ -21,6 +22,14 @@ class TestCardType(unittest.TestCase):
         self.assertEqual(CardType.NEUTRAL.value, "neutral")
         self.assertEqual(CardType.ASSASSIN.value, "assassin")
 
+    def test_card_type_codes(self):
+        """Test that every CardType has a unique small integer code"""
+        self.assertEqual(set(_CARD_TYPE_CODE), set(CardType))
+        self.assertEqual(len(set(_CARD_TYPE_CODE.values())), len(CardType))
+        for card_type, code in _CARD_TYPE_CODE.items():
+            self.assertTrue(0 <= code < 16)
+            self.assertIs(_CODE_CARD_TYPE[code], card_type)
+
 
 class TestCard(unittest.TestCase):
     """Tests for the Card class"""
@@ -31,6 +40,8 @@ class TestCard(unittest.TestCase):
         self.assertEqual(card.word, "test")
         self.assertEqual(card.type, CardType.RED)
         self.assertFalse(card.revealed)
+        # Cards use __slots__ rather than a per-instance __dict__
+        self.assertFalse(hasattr(card, "__dict__"))
     
     def test_card_reveal(self):
         """Test revealing a card"""
@@ -97,13 +108,64 @@ class TestGameState(unittest.TestCase):
         self.assertEqual(self.game_state.clue_history, [])
         self.assertEqual(self.game_state.guess_history, [])
     
+    def test_board_indices(self):
+        """Test the lookups derived from the board"""
+        self.assertEqual(self.game_state.word_index["cherry"], 2)
+        self.assertIs(self.game_state.card_for_word("Cherry"), self.board[2])
+        self.assertIsNone(self.game_state.card_for_word("kiwi"))
+        self.assertIn("elderberry", self.game_state.board_words_lower_set)
+        self.assertEqual(list(self.game_state.board_types), [_CARD_TYPE_CODE[card.type] for card in self.board])
+        self.assertEqual(self.game_state.board_revealed, bytearray(5))
+        self.assertEqual(self.game_state.count_unrevealed(CardType.RED), 2)
+        self.assertEqual(self.game_state.count_unrevealed(CardType.ASSASSIN), 1)
+        self.assertEqual(self.game_state.unrevealed_words(CardType.RED), ["apple", "elderberry"])
+        self.assertEqual(self.game_state.unrevealed_lower_words, ("apple", "banana", "cherry", "date", "elderberry"))
+        self.assertNotIn("word_index", self.game_state.to_dict())
+    
+    def test_reveal(self):
+        """Test that revealing a card updates the card and the board lookups"""
+        self.assertEqual(self.game_state.unrevealed_lower_words, ("apple", "banana", "cherry", "date", "elderberry"))
+        self.game_state.reveal(0)
+        self.assertTrue(self.board[0].revealed)
+        self.assertEqual(self.game_state.board_revealed[0], 1)
+        self.assertEqual(self.game_state.count_unrevealed(CardType.RED), 1)
+        self.assertEqual(self.game_state.unrevealed_words(CardType.RED), ["elderberry"])
+        self.assertEqual(self.game_state.unrevealed_lower_words, ("banana", "cherry", "date", "elderberry"))
+        
+        self.game_state.reveal(0, False)
+        self.assertFalse(self.board[0].revealed)
+        self.assertEqual(self.game_state.count_unrevealed(CardType.RED), 2)
+        self.assertEqual(self.game_state.unrevealed_words(CardType.RED), ["apple", "elderberry"])
+    
+    def test_history_rows(self):
+        """Test that the history rows are cached and follow the columns"""
+        self.game_state.clue_teams.append(CardType.RED)
+        self.game_state.clue_words.append("fruit")
+        self.game_state.clue_counts.append(2)
+        self.game_state.clue_targets.append(["apple", "elderberry"])
+        clue_history = self.game_state.clue_history
+        self.assertEqual(clue_history, [(CardType.RED, "fruit", 2, ["apple", "elderberry"])])
+        self.assertIs(self.game_state.clue_history, clue_history)
+        
+        for word, correct in (("apple", True), ("banana", False)):
+            self.game_state.guess_teams.append(CardType.RED)
+            self.game_state.guess_words.append(word)
+            self.game_state.guess_correct.append(correct)
+            self.assertEqual(self.game_state.guess_history[-1], (CardType.RED, word, correct))
+        self.assertEqual([guess.word for guess in self.game_state.guess_history], ["apple", "banana"])
+        
+        self.game_state.guess_teams.clear()
+        self.game_state.guess_words.clear()
+        self.game_state.guess_correct.clear()
+        self.assertEqual(self.game_state.guess_history, [])
+    
     def test_get_visible_state(self):
         """Test getting the visible state for operatives"""
         # Reveal one card
-        self.game_state.board[0].revealed = True
+        self.game_state.reveal(0)
         
         # Get visible state for red team - now returns a GameState object
-        visible_state = self.game_state.get_visible_state(CardType.RED)
+        visible_state = self.game_state.get_visible_state()
         
         # Check that the visible state has the correct structure
         self.assertEqual(visible_state.game_id, "test_game")
@@ -131,10 +193,10 @@ class TestGameState(unittest.TestCase):
     def test_get_spymaster_state(self):
         """Test getting the game state for spymasters"""
         # Reveal one card
-        self.game_state.board[0].revealed = True
+        self.game_state.reveal(0)
         
         # Get spymaster state for red team - now returns a GameState object
-        spymaster_state = self.game_state.get_spymaster_state(CardType.RED)
+        spymaster_state = self.game_state.get_spymaster_state()
         
         # Check that the state has the correct structure
         self.assertEqual(spymaster_state.game_id, "test_game")
@@ -154,12 +216,33 @@ class TestGameState(unittest.TestCase):
         self.assertEqual(spymaster_state.board[3].word, "date")
         self.assertEqual(spymaster_state.board[3].type, CardType.ASSASSIN)
         
+        # The copy is independent of the original state
+        spymaster_state.reveal(1)
+        spymaster_state.clue_words.append("fruit")
+        self.assertFalse(self.game_state.board[1].revealed)
+        self.assertEqual(self.game_state.clue_words, [])
+        
         # Test conversion to dictionary
         spymaster_dict = spymaster_state.to_dict()
         self.assertEqual(spymaster_dict["game_id"], "test_game")
         self.assertEqual(spymaster_dict["current_team"], CardType.RED)
         self.assertEqual(spymaster_dict["board"][1]["type"], CardType.BLUE)
     
+    def test_get_visible_state_bytes(self):
+        """Test the compact byte encoding of the operative view"""
+        self.game_state.reveal(0)
+        self.game_state.reveal(3)
+
+        encoded = self.game_state.get_visible_state_bytes()
+
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(len(encoded), 5)
+        self.assertEqual(encoded[0], 0x80 | _CARD_TYPE_CODE[CardType.RED])
+        self.assertEqual(encoded[3], 0x80 | _CARD_TYPE_CODE[CardType.ASSASSIN])
+        # Unrevealed cards never leak their type
+        for i in (1, 2, 4):
+            self.assertEqual(encoded[i], _CARD_TYPE_CODE[CardType.UNKNOWN])
+
     def test_is_game_over(self):
         """Test the is_game_over method"""
         # Initially, game is not over
@@ -225,6 +308,33 @@ class TestGameEngine(unittest.TestCase):
         self.assertEqual(len(game.board), 25)
         self.assertIsNone(game.winner)
     
+    def test_create_game_is_reproducible(self):
+        """Test that the same seed gives the same board, even after other games"""
+        engine = GameEngine(WORD_LIST)
+        first = engine.get_game(engine.create_game(seed=42))
+        engine.create_game(seed=7)
+        second = engine.get_game(engine.create_game(seed=42))
+
+        self.assertEqual([(c.word, c.type) for c in first.board],
+                         [(c.word, c.type) for c in second.board])
+        self.assertEqual(first.current_team, second.current_team)
+
+    def test_create_games_batch(self):
+        """Test that batch creation gives the same boards as create_game"""
+        engine = GameEngine(WORD_LIST)
+        game_ids = engine.create_games_batch(3, seeds=[1, 2, 3])
+        self.assertEqual(len(set(game_ids)), 3)
+
+        for seed, game_id in zip([1, 2, 3], game_ids):
+            batch_game = engine.get_game(game_id)
+            single_game = engine.get_game(engine.create_game(seed=seed))
+            self.assertEqual([(c.word, c.type) for c in batch_game.board],
+                             [(c.word, c.type) for c in single_game.board])
+            self.assertEqual(batch_game.random_seed, seed)
+            self.assertEqual(batch_game.red_remaining + batch_game.blue_remaining, 17)
+
+        self.assertEqual(len(engine.create_games_batch(5)), 5)
+
     def test_validate_clue(self):
         """Test validating a clue from a spymaster"""
         # Create a game
@@ -244,6 +354,10 @@ class TestGameEngine(unittest.TestCase):
         self.assertFalse(result['is_valid'])
         self.assertIn("turn", result['error'])
         
+        # The turn check comes before clue word checks
+        result = self.engine.validate_clue(game, "two words", card_words, wrong_team)
+        self.assertIn("turn", result['error'])
+        
         # Test game already over
         game.winner = CardType.RED
         result = self.engine.validate_clue(game, "fruit", card_words, game.current_team)
@@ -272,6 +386,23 @@ class TestGameEngine(unittest.TestCase):
         self.assertFalse(result['is_valid'])
         self.assertIn("Duplicate", result['error'])
         
+    def test_validate_clue_trusted(self):
+        """Test the trusted clue validation used by AI loops"""
+        game_id = self.engine.create_game()
+        game = self.engine.get_game(game_id)
+        card_words = [card.word for card in game.board[:2]]
+        wrong_team = CardType.BLUE if game.current_team == CardType.RED else CardType.RED
+        
+        self.assertIsNone(self.engine.validate_clue_trusted(game, "fruit", card_words, game.current_team))
+        self.assertIn("turn", self.engine.validate_clue_trusted(game, "fruit", card_words, wrong_team))
+        self.assertIn("appears on the board",
+                      self.engine.validate_clue_trusted(game, game.board[0].word.upper(), card_words, game.current_team))
+        
+        # process_clue can use the trusted path and still rejects invalid clues
+        self.assertTrue(self.engine.process_clue(game_id, "fruit", card_words, game.current_team, trusted=True))
+        with self.assertRaises(ValueError):
+            self.engine.process_clue(game_id, "two words", card_words, game.current_team, trusted=True)
+        
     def test_validate_clue_type_validation(self):
         """Test type validation in the validate_clue method"""
         # Create a game
@@ -322,6 +453,17 @@ class TestGameEngine(unittest.TestCase):
         self.assertEqual(game.clue_history[0][1], "fruit")
         self.assertEqual(game.clue_history[0][2], len(selected_cards))
         self.assertEqual(game.clue_history[0][3], selected_cards)
+        self.assertEqual(game.clue_history[0].word, "fruit")
+        self.assertEqual(game.clue_history[0].count, len(selected_cards))
+        self.assertEqual(game.clue_words, ["fruit"])
+        self.assertEqual(game.clue_counts, [len(selected_cards)])
+        state = game.to_dict()
+        self.assertEqual(set(state), {"game_id", "board", "red_remaining", "blue_remaining", "current_team",
+                                      "winner", "turn_count", "random_seed", "clue_history", "guess_history"})
+        self.assertEqual(state["clue_history"], [(game.current_team, "fruit", len(selected_cards), selected_cards)])
+        self.assertIsNot(state["clue_history"][0][3], game.clue_targets[0])
+        self.assertEqual(state["guess_history"], [])
+        self.assertEqual(state["board"][0], {"word": game.board[0].word, "type": game.board[0].type, "revealed": False})
         
         # Test invalid cases
         
@@ -335,9 +477,20 @@ class TestGameEngine(unittest.TestCase):
             self.engine.process_clue(game_id, game.board[0].word, selected_cards, game.current_team)
         
         # Test invalid game ID
-        with self.assertRaises(AssertionError):
+        with self.assertRaises(KeyError):
             self.engine.process_clue("invalid_id", "test", selected_cards, game.current_team)
     
+    def test_process_guess_card_revealed(self):
+        """Test that a card revealed through GameState.reveal can't be guessed again"""
+        game_id = self.engine.create_game(seed=0)
+        game = self.engine.get_game(game_id)
+        team_card = next(card for card in game.board if card.type == game.current_team)
+        game.reveal(game.board.index(team_card))
+        
+        self.assertNotIn(team_card.word, game.unrevealed_words(game.current_team))
+        result = self.engine.process_guess(game_id, team_card.word, game.current_team)
+        self.assertFalse(result["success"])
+    
     def test_process_guess(self):
         """Test processing a guess from an operative"""
         # Create a game
@@ -369,6 +522,17 @@ class TestGameEngine(unittest.TestCase):
         self.assertEqual(result["card_type"], current_team.value)
         self.assertFalse(result["end_turn"])
         self.assertTrue(team_card.revealed)
+        self.assertEqual(game.board_revealed[game.board.index(team_card)], 1)
+        self.assertNotIn(team_card.word.lower(), game.unrevealed_lower_words)
+        self.assertEqual(len(game.unrevealed_lower_words), 24)
+        self.assertEqual(game.guess_history[-1].word, team_card.word)
+        self.assertTrue(game.guess_history[-1].correct)
+        self.assertEqual(game.count_unrevealed(current_team), initial_red_remaining - 1
+                         if current_team == CardType.RED else initial_blue_remaining - 1)
+        
+        # Guessing the same card again is rejected
+        result = self.engine.process_guess(game_id, team_card.word.upper(), current_team)
+        self.assertFalse(result["success"])
         
         # The team count should have decreased by 1 for current team
         if current_team == CardType.RED:
@@ -397,13 +561,36 @@ class TestGameEngine(unittest.TestCase):
         
         # The opponent count should have decreased
         if opponent_team == CardType.RED:
-            self.assertEqual(game.red_remaining, 8)
+            self.assertEqual(game.red_remaining, initial_red_remaining - 1)
         else:
-            self.assertEqual(game.blue_remaining, 7)
+            self.assertEqual(game.blue_remaining, initial_blue_remaining - 1)
         
         # The current team should have changed
         self.assertEqual(game.current_team, opponent_team)
     
+    def test_process_guess_result(self):
+        """Test the GuessResult returned by process_guess_result"""
+        engine = GameEngine(WORD_LIST)
+        game_id = engine.create_game(seed=11)
+        game = engine.get_game(game_id)
+        team = game.current_team
+        team_card = next(card for card in game.board if card.type == team)
+        
+        result = engine.process_guess_result(game_id, team_card.word, team)
+        self.assertEqual(result, GuessResult(True, team.value, False))
+        self.assertEqual(result.to_dict(), {"success": True, "card_type": team.value, "end_turn": False})
+        
+        result = engine.process_guess_result(game_id, team_card.word, team)
+        self.assertFalse(result.success)
+        self.assertEqual(result.to_dict(), {"success": False, "error": result.error})
+        
+        assassin = next(card for card in game.board if card.type == CardType.ASSASSIN)
+        result = engine.process_guess_result(game_id, assassin.word, team)
+        self.assertTrue(result.game_over)
+        self.assertTrue(result.end_turn)
+        self.assertEqual(result.winner, game.winner.value)
+        self.assertIsNone(engine.process_guess_result(game_id, assassin.word, game.current_team))
+    
     def test_assassin_guess(self):
         """Test guessing the assassin card"""
         # Create a game
@@ -436,6 +623,9 @@ class TestGameEngine(unittest.TestCase):
         expected_winner = CardType.BLUE if current_team == CardType.RED else CardType.RED
         self.assertEqual(result["winner"], expected_winner.value)
         self.assertEqual(game.winner, expected_winner)
+
+        # The result dict serializes to JSON with plain strings
+        self.assertEqual(json.loads(json.dumps(result))["card_type"], "assassin")
     
     def test_win_by_guessing_all_cards(self):
         """Test winning by guessing all cards"""
@@ -508,7 +698,7 @@ class TestGameEngine(unittest.TestCase):
         self.assertFalse(result)
         
         # Invalid game ID
-        with self.assertRaises(AssertionError):
+        with self.assertRaises(KeyError):
             self.engine.end_turn("invalid_id", next_team)
     
     def test_get_game(self):
@@ -0,0 +1,104 @@
+"""
+Unit tests for Codenames logging utilities.
+Tests the handler setup and the NDJSON game event files of GameLogger.
+"""
+
+import unittest
+from unittest.mock import patch
+import json
+import logging
+import os
+import tempfile
+
+from codenames.game import CardType
+from codenames.utils import logging as game_logging
+from codenames.utils.logging import GameLogger
+
+
+class TestGameLogger(unittest.TestCase):
+    """Tests for the GameLogger class"""
+
+    def setUp(self):
+        """Set up test cases"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_dir = os.path.join(self.tmp_dir.name, "logs")
+
+    def tearDown(self):
+        """Remove the handlers installed for the test log directory"""
+        game_logging._stop_queue_listener()
+        game_logging._handler_config = None
+        codenames_logger = logging.getLogger("codenames")
+        for handler in list(codenames_logger.handlers):
+            codenames_logger.removeHandler(handler)
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def _console_handlers():
+        """Handlers of the queue listener that write to the console"""
+        return [handler for handler in game_logging._queue_listener.handlers
+                if type(handler) is logging.StreamHandler]
+
+    def test_handlers_installed_once(self):
+        """Test that a second GameLogger on the same log file keeps the existing handlers"""
+        first = GameLogger(self.log_dir, console=False)
+        handlers = list(first.logger.handlers)
+        listener = game_logging._queue_listener
+
+        second = GameLogger(self.log_dir, console=False)
+
+        self.assertEqual(len(handlers), 1)
+        self.assertEqual(second.logger.handlers, handlers)
+        self.assertIs(game_logging._queue_listener, listener)
+
+    def test_console_off_by_default(self):
+        """Test that console output is only added when requested"""
+        with patch.dict(os.environ, {"CODENAMES_LOG_CONSOLE": ""}):
+            GameLogger(self.log_dir)
+        self.assertEqual(self._console_handlers(), [])
+
+        with patch.dict(os.environ, {"CODENAMES_LOG_CONSOLE": "1"}):
+            GameLogger(self.log_dir)
+        self.assertEqual(len(self._console_handlers()), 1)
+
+        GameLogger(self.log_dir, console=False)
+        self.assertEqual(self._console_handlers(), [])
+
+        GameLogger(self.log_dir, console=True)
+        self.assertEqual(len(self._console_handlers()), 1)
+
+    def test_events_round_trip(self):
+        """Test that game events are written to the game's NDJSON file and read back"""
+        game_logger = GameLogger(self.log_dir, console=False)
+        game_logger.start_game("game1", {"red_team_size": 2})
+        game_logger.log_clue("red", "fruit", 2, ["apple", "banana"])
+        game_logger.log_guess("red", "apple", {"success": True, "card_type": "red"})
+        game_logger.log_ai_decision("Operative 1", "guess", {"team": CardType.RED, "reasoning": "A fruit"})
+        game_logger.log_game_end("red", {"turn_count": 3})
+
+        self.assertEqual(os.path.basename(game_logger.events_file), f"game1_{os.getpid()}.ndjson")
+        with open(game_logger.events_file, encoding="utf-8") as f:
+            events = [json.loads(line) for line in f]
+
+        self.assertEqual([event["type"] for event in events], ["game_start", "clue", "guess", "ai_decision", "game_end"])
+        self.assertTrue(all(event["game_id"] == "game1" for event in events))
+        self.assertTrue(all(isinstance(event["timestamp_ns"], int) for event in events))
+        self.assertEqual(events[0]["config"], {"red_team_size": 2})
+        self.assertEqual(events[1]["targets"], ["apple", "banana"])
+        self.assertEqual(events[2]["result"], {"success": True, "card_type": "red"})
+        # Enums are stored as their values
+        self.assertEqual(events[3]["data"], {"team": "red", "reasoning": "A fruit"})
+        self.assertEqual(events[4]["turns"], 3)
+
+    def test_events_flushed_on_close(self):
+        """Test that events of an unfinished game reach the file once the logger is closed"""
+        game_logger = GameLogger(self.log_dir, console=False)
+        game_logger.start_game("game2", {})
+        game_logger.log_turn_end("blue", "wrong guess")
+        game_logger.close()
+
+        with open(game_logger.events_file, encoding="utf-8") as f:
+            self.assertEqual([json.loads(line)["type"] for line in f], ["game_start", "turn_end"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import os
 import pathlib
+import openai
 from openai import OpenAI
 import os
 from dotenv import load_dotenv
@@ -28,7 +29,8 @@ def setup_logging():
     
     # Create a timestamp for the log file
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = os.path.join(logs_dir, f"game_log_{timestamp}.txt")
+    # The process ID keeps games started in the same second by parallel experiments apart
+    log_file = os.path.join(logs_dir, f"game_log_{timestamp}_{os.getpid()}.txt")
     
     # Create a class to duplicate stdout to both console and file
     class Logger(object):
@@ -61,6 +63,55 @@ def log_event(event_name, **kwargs):
     print(f"Weave event: {event_name} - {kwargs}")
 
 
+# Failures of a flaky network or API provider, retried where the request is made
+TRANSIENT_API_ERRORS = (
+    openai.APIConnectionError,  # includes openai.APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+# Attempts per API request before a transient failure is given up on
+API_ATTEMPTS = 3
+
+# Upper bound in seconds for the exponential backoff between attempts
+MAX_RETRY_BACKOFF = 60.0
+
+
+class GameAPIError(RuntimeError):
+    """
+    An API request of the game failed for good, so the game can't be played out.
+
+    Raised out of play_codenames_game instead of letting the agents fall back to
+    placeholder moves. It carries only a message, so unlike openai's errors it can
+    be pickled back from the experiments' game processes.
+    """
+
+
+def create_chat_completion(client, **kwargs):
+    """
+    client.chat.completions.create(**kwargs), retrying transient failures with
+    exponential backoff.
+
+    Raises:
+        GameAPIError: If the request failed API_ATTEMPTS times, or with a
+            non-transient API error (e.g. authentication or a bad request)
+    """
+    start_time = time.monotonic()
+    for attempt in range(1, API_ATTEMPTS + 1):
+        try:
+            return client.chat.completions.create(**kwargs)
+        except TRANSIENT_API_ERRORS as e:
+            if attempt == API_ATTEMPTS:
+                raise GameAPIError(f"{kwargs.get('model')} request failed {attempt} times, "
+                                   f"last with {type(e).__name__}: {e}") from None
+            delay = min(MAX_RETRY_BACKOFF, 2.0 ** attempt)
+            print(f"API request failed with {type(e).__name__} (attempt {attempt} of {API_ATTEMPTS}, "
+                  f"elapsed {time.monotonic() - start_time:.1f}s), retrying in {delay:.0f}s")
+            time.sleep(delay)
+        except openai.APIError as e:
+            raise GameAPIError(f"{kwargs.get('model')} request failed with {type(e).__name__}: {e}") from None
+
+
 # Importing codenames game engine components
 class CardType(Enum):
     RED = "red"
@@ -439,13 +490,15 @@ class SimpleSpymasterAgent:
         # Use OpenRouter with direct API key
         client = OpenAI(
             base_url="https://openrouter.ai/api/v1",
-            api_key=OPENROUTER_API_KEY
+            api_key=OPENROUTER_API_KEY,
+            max_retries=0  # retried by create_chat_completion
         )
         # Format prompt with strict instructions for JSON output
         enhanced_prompt = prompt + "\n\nYou MUST respond ONLY with a valid JSON object and nothing else. No explanations before or after the JSON. The JSON structure must be: {\"reasoning\": \"your reasoning\", \"clue\": \"your_clue_word\", \"selected_words\": [\"word1\", \"word2\"]}"
         
         try:
-            response = client.chat.completions.create(
+            response = create_chat_completion(
+                client,
                 model=self.model,
                 messages=[
                     {"role": "system", "content": enhanced_prompt}
@@ -469,6 +522,8 @@ class SimpleSpymasterAgent:
                 
             # Process response and manually parse JSON
             response_text = response.choices[0].message.content
+        except GameAPIError:
+            raise
         except Exception as e:
             print(f"Error in spymaster API call: {str(e)}")
             # Return a default clue
@@ -553,10 +608,12 @@ class SimpleOperativeAgent:
         # Use OpenRouter with direct API key
         client = OpenAI(
             base_url="https://openrouter.ai/api/v1",
-            api_key=OPENROUTER_API_KEY
+            api_key=OPENROUTER_API_KEY,
+            max_retries=0  # retried by create_chat_completion
         )
         try:
-            completion = client.chat.completions.create(
+            completion = create_chat_completion(
+                client,
                 model=self.model,
                 messages=[
                     {"role": "user", "content": prompt},
@@ -574,6 +631,8 @@ class SimpleOperativeAgent:
             else:
                 print(f"Warning: Failed to get response from {self.model} for operative {self.name}")
                 return f"I'm having trouble thinking of words related to '{clue_word}' right now."  
+        except GameAPIError:
+            raise
         except Exception as e:
             print(f"Error getting response from {self.model} for operative {self.name}: {str(e)}")
             return f"I'm having trouble thinking of words related to '{clue_word}' right now."
@@ -606,7 +665,8 @@ class DebateJudge:
         # Use OpenRouter with direct API key
         client = OpenAI(
             base_url="https://openrouter.ai/api/v1",
-            api_key=OPENROUTER_API_KEY
+            api_key=OPENROUTER_API_KEY,
+            max_retries=0  # retried by create_chat_completion
         )
         
         # Format prompt with strict instructions for JSON output
@@ -614,7 +674,8 @@ class DebateJudge:
         
         try:
             # Make API call with the model specified during initialization
-            response = client.chat.completions.create(
+            response = create_chat_completion(
+                client,
                 model=self.model,
                 messages=[
                     {"role": "system", "content": enhanced_prompt}
@@ -639,6 +700,8 @@ class DebateJudge:
                 
             # Extract reasoning from the response
             response_text = response.choices[0].message.content
+        except GameAPIError:
+            raise
         except Exception as e:
             print(f"Error in debate judge API call: {str(e)}")
             # Return a default result
@@ -732,14 +795,27 @@ def play_codenames_game(
         
     Returns:
         The final game state and game outcome
+    
+    Raises:
+        GameAPIError: If an API request kept failing, so the game couldn't be played out
     """
     
-    # Set up logging to file if requested
-    original_stdout = None
-    log_file = None
+    # Set up logging to file if requested; stdout is restored however the game ends
+    original_stdout = sys.stdout
     if setup_logging_file:
-        log_file = setup_logging()
-        original_stdout = sys.stdout
+        setup_logging()
+    try:
+        return _play_game(team_red_size, team_blue_size, max_turns, seed, debate_rounds,
+                          red_model, blue_model, judge_model, red_models, blue_models)
+    finally:
+        if sys.stdout is not original_stdout:
+            sys.stdout.log.close()
+            sys.stdout = original_stdout
+
+
+def _play_game(team_red_size, team_blue_size, max_turns, seed, debate_rounds,
+               red_model, blue_model, judge_model, red_models, blue_models):
+    """Play one game with stdout already set up; see play_codenames_game"""
     
     # Backward compatibility: If no models are provided, use the default model for each team
     # The +1 is for the spymaster
@@ -1093,10 +1169,6 @@ def play_codenames_game(
     print(f"Outcome: {game_outcome['win_reason']}")
     print(f"Total game time: {game_outcome['game_duration_seconds']:.2f} seconds")
     
-    # Restore original stdout if we changed it
-    if original_stdout:
-        sys.stdout = original_stdout
-    
     # Return both the game state and detailed outcome information
     return game_state, game_outcome
 
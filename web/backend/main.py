@@ -107,11 +107,10 @@ async def broadcast_game_state(game_id: str):
             websocket = connected_clients[player_id]
             
             # Determine which view to send based on player role
-            team = get_card_type_enum(player_info["team"])
             if player_info["role"] == "spymaster":
-                state = game.get_spymaster_state(team)
+                state = game.get_spymaster_state()
             else:
-                state = game.get_visible_state(team)
+                state = game.get_visible_state()
                 
             # Add additional game info
             state["current_player"] = {